@@ -1,8 +1,9 @@
 import streamlit as st
 import tempfile
 import os
+import time
 
-from run_pipeline import run
+from job_queue import JobQueue, QuotaExceeded
 
 st.set_page_config(
     page_title="Parts",
@@ -12,6 +13,27 @@ st.set_page_config(
 
 st.title("📄 Parts Extractor — PDF → Excel")
 
+# Extractions run as background jobs shared by every session
+JOBS_DIR = os.path.join(tempfile.gettempdir(), "parts_jobs")
+JOB_WORKERS = int(os.environ.get("PARTS_JOB_WORKERS", "2"))
+
+# Disk space for uploads + outputs, and how long finished jobs are kept
+JOBS_QUOTA_MB = int(os.environ.get("PARTS_JOBS_QUOTA_MB", "5120"))
+JOB_MAX_AGE_HOURS = float(os.environ.get("PARTS_JOB_MAX_AGE_HOURS", "24"))
+
+
+@st.cache_resource
+def get_job_queue():
+    return JobQueue(
+        JOBS_DIR,
+        workers=JOB_WORKERS,
+        quota_bytes=JOBS_QUOTA_MB * 1024 ** 2,
+        max_age=JOB_MAX_AGE_HOURS * 3600
+    )
+
+
+jobs = get_job_queue()
+
 
 # ======================================================
 # HALF PAGE LAYOUT
@@ -101,6 +123,12 @@ with left:
         value=False
     )
 
+    engine = st.selectbox(
+        "Extraction engine",
+        ["pdfplumber", "pymupdf"],
+        help="pymupdf is much faster; pdfplumber is the reference engine"
+    )
+
     # 🚀 RUN BUTTON
     run_clicked = st.button(
         "🚀 Run Extraction",
@@ -109,7 +137,7 @@ with left:
 
 
 # ======================================================
-# PROCESSING (OUTSIDE COLUMN)
+# SUBMIT JOB (OUTSIDE COLUMN)
 # ======================================================
 
 if run_clicked:
@@ -118,36 +146,102 @@ if run_clicked:
         st.error("Please upload a PDF file")
         st.stop()
 
-    temp_dir = tempfile.gettempdir()
-    pdf_path = os.path.join(temp_dir, uploaded_file.name)
+    # Each job works in its own directory: same-named uploads from
+    # concurrent sessions can't collide, and expired jobs are removed
+    try:
+        job_id = jobs.new_job(uploaded_file.size)
+    except QuotaExceeded as e:
+        st.error(str(e))
+        st.stop()
 
-    with open(pdf_path, "wb") as f:
-        f.write(uploaded_file.read())
+    pdf_path = jobs.save_upload(job_id, uploaded_file, uploaded_file.name)
+
+    job_id = jobs.submit(
+        job_id=job_id,
+        label=uploaded_file.name,
+        pdf_path=pdf_path,
+        output_csv=jobs.output_path(job_id, uploaded_file.name),
+        vendor=vendor,
+        model=model,
+        project=project,
+        subproject=subproject,
+        equipment=equipment,
+        debug=debug,
+        pages=pages,
+        engine=engine,
+        use_cache=True
+    )
 
-    output_csv = pdf_path.replace(".pdf", ".csv")
+    # In the URL too, so a refresh or reconnect finds the job again
+    st.session_state["job_id"] = job_id
+    st.query_params["job"] = job_id
 
-    progress = st.progress(0)
-    progress.progress(20)
 
-    with st.spinner("Processing document..."):
+# ======================================================
+# RIGHT SIDE — JOB STATUS
+# ======================================================
 
-        output_xlsx = run(
-            pdf_path=pdf_path,
-            output_csv=output_csv,
-            vendor=vendor,
-            model=model,
-            project=project,
-            subproject=subproject,
-            equipment=equipment,
-            debug=debug,
-            pages=pages
-        )
+with right:
+
+    st.subheader("Job")
+
+    job_id = st.text_input(
+        "Job ID",
+        value=st.session_state.get("job_id") or st.query_params.get("job", ""),
+        help="Paste a job ID to follow a job started earlier"
+    ).strip()
+
+    job = jobs.status(job_id) if job_id else None
 
-    progress.progress(100)
+    if job_id and job is None:
+        st.error("Unknown job ID")
 
-    st.success("Extraction completed!")
+    if job:
+        st.session_state["job_id"] = job_id
 
-    st.session_state["output_xlsx"] = output_xlsx
+        st.caption(f"{job['label']} · {job['status']}")
+
+        progress = job.get("progress") or {}
+        total_pages = progress.get("total_pages") or 0
+        pages_done = progress.get("pages_done", 0)
+
+        if job["status"] in ("queued", "running"):
+
+            if job["status"] == "queued":
+                st.progress(0, text="Waiting for a free worker...")
+
+            elif total_pages:
+                elapsed = time.time() - job.get("started", job["created"])
+                eta = elapsed / pages_done * (total_pages - pages_done) if pages_done else None
+
+                st.progress(
+                    pages_done / total_pages,
+                    text=(
+                        f"Page {pages_done}/{total_pages} · {progress.get('parts', 0)} parts"
+                        f" · {progress.get('table_mode') or ''}"
+                        + (f" · ~{eta:.0f}s left" if eta is not None else "")
+                    )
+                )
+
+            else:
+                st.progress(0, text="Starting...")
+
+            if st.button("✖ Cancel job"):
+                jobs.cancel(job_id)
+
+            # Poll until the job finishes
+            time.sleep(1)
+            st.rerun()
+
+        elif job["status"] == "done":
+            st.progress(1.0, text=f"{pages_done} pages · {progress.get('parts', 0)} parts")
+            st.success("Extraction completed!")
+
+        elif job["status"] == "cancelled":
+            st.warning(f"Cancelled after {pages_done} pages")
+
+        else:
+            st.error(f"Extraction failed: {job.get('error')}")
 
 
 # ======================================================
@@ -156,20 +250,12 @@ if run_clicked:
 
 with left:
 
-    if "output_xlsx" in st.session_state:
-        with open(st.session_state["output_xlsx"], "rb") as f:
+    if job and job["status"] == "done" and os.path.exists(job["output"]):
+        with open(job["output"], "rb") as f:
             st.download_button(
                 "⬇️ Download Excel Output",
                 f,
-                file_name=os.path.basename(st.session_state["output_xlsx"]),
+                file_name=os.path.basename(job["output"]),
                 mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
                 use_container_width=True
             )
-
-
-# ======================================================
-# RIGHT SIDE — EMPTY
-# ======================================================
-
-with right:
-    st.empty()
@@ -0,0 +1,239 @@
+"""
+End-to-end pipeline benchmark.
+
+Builds a synthetic manual per case (benchmarks.fixtures, every table
+layout cycled over --pages pages with --rows rows each) and, optionally,
+runs recorded real manuals (--pdf). Each case runs run_pipeline.run in
+a fresh process and reports pages/sec, per-stage latency (from
+PipelineStats), peak RSS, and for synthetic manuals any page whose
+table type differs from the layout it was drawn with.
+
+Results are compared with a stored baseline: slower throughput or
+higher peak RSS beyond --tolerance, a different parts count, or a
+misclassified page is a regression and the script exits non-zero.
+Baselines are machine-specific; record one with --save-baseline.
+
+Usage:
+    python -m benchmarks.bench_pipeline [--pages 64] [--rows 25 60]
+        [--engine pdfplumber pymupdf] [--workers 1] [--pdf manual.pdf ...]
+        [--save-baseline] [--baseline benchmarks/baseline.json]
+"""
+
+import argparse
+import json
+import os
+import resource
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from benchmarks.fixtures import LAYOUTS, build_manual
+
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+# Stages listed in the report, in pipeline order (others are summed into the total)
+REPORT_STAGES = (
+    "step1.words",
+    "normalize",
+    "step2.is_parts_table",
+    "classify",
+    "extract.INLINE",
+    "title",
+)
+
+
+def _peak_rss_mb():
+    """
+    Peak RSS of this process or of its largest reaped child (the shard
+    workers of a parallel run), whichever is higher. Children only
+    count once waited for, so read it after run()'s pool has shut down.
+    """
+    peak = max(
+        resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    )
+    # kilobytes on Linux, bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _run_case(pdf_path, engine, workers, out_dir):
+    """Runs in its own process so peak RSS belongs to this case alone."""
+
+    from multitable_inline.instrumentation import PipelineStats
+    from run_pipeline import run
+
+    stats = PipelineStats()
+
+    t0 = time.perf_counter()
+    run(
+        pdf_path,
+        os.path.join(out_dir, "parts.xlsx"),
+        vendor="BENCH",
+        model="BENCH",
+        workers=workers,
+        engine=engine,
+        stats=stats
+    )
+    seconds = time.perf_counter() - t0
+
+    # run() has shut its worker pool down (wait=True), so the workers
+    # are reaped and show up in RUSAGE_CHILDREN
+    rss_mb = _peak_rss_mb()
+
+    report = stats.report()
+
+    return {
+        "seconds": seconds,
+        "rss_mb": rss_mb,
+        "stages": report["stages"],
+        "counters": report["counters"],
+        "table_types": {r["page"]: r["table_type"] for r in report["pages"]},
+    }
+
+
+def run_case(name, pdf_path, engine, workers, repeat=1, plan=None):
+    """Best of repeat runs of one case, as a baseline-comparable dict."""
+
+    best = None
+
+    for _ in range(repeat):
+        with tempfile.TemporaryDirectory() as out_dir:
+            with ProcessPoolExecutor(max_workers=1) as pool:
+                result = pool.submit(_run_case, pdf_path, engine, workers, out_dir).result()
+
+        if best is None or result["seconds"] < best["seconds"]:
+            best = result
+
+    pages = best["counters"].get("pages", 0)
+
+    misclassified = []
+
+    if plan:
+        for page, layout in enumerate(plan, start=1):
+            expected = LAYOUTS[layout][1]
+            got = best["table_types"].get(page)
+            if got != expected:
+                misclassified.append(f"p{page} {layout}: {got}")
+
+    return {
+        "case": name,
+        "pages": pages,
+        "parts": best["counters"].get("parts", 0),
+        "seconds": round(best["seconds"], 4),
+        "pages_per_sec": round(pages / best["seconds"], 2) if best["seconds"] else 0.0,
+        "rss_mb": round(best["rss_mb"], 1),
+        "stage_ms_per_page": {
+            stage: round(entry["seconds"] * 1000 / pages, 3) if pages else 0.0
+            for stage, entry in best["stages"].items()
+        },
+        "misclassified": misclassified,
+    }
+
+
+# ==================================================
+# BASELINE COMPARISON
+# ==================================================
+def compare(result, baseline, tolerance):
+    """Regression messages for one case against its baseline entry."""
+
+    problems = [f"misclassified {m}" for m in result["misclassified"]]
+
+    if baseline is None:
+        return problems
+
+    if result["parts"] != baseline["parts"]:
+        problems.append(f"parts {baseline['parts']} -> {result['parts']}")
+
+    if result["pages_per_sec"] < baseline["pages_per_sec"] * (1 - tolerance):
+        problems.append(f"pages/sec {baseline['pages_per_sec']} -> {result['pages_per_sec']}")
+
+    if result["rss_mb"] > baseline["rss_mb"] * (1 + tolerance):
+        problems.append(f"peak RSS {baseline['rss_mb']} MB -> {result['rss_mb']} MB")
+
+    return problems
+
+
+def print_result(result, baseline):
+    ref = f"  (baseline {baseline['pages_per_sec']} p/s)" if baseline else ""
+
+    print(
+        f"\n{result['case']}\n"
+        f"  pages {result['pages']}  parts {result['parts']}  "
+        f"{result['seconds']:.2f}s  {result['pages_per_sec']} pages/sec{ref}  "
+        f"peak RSS {result['rss_mb']} MB"
+    )
+
+    stages = result["stage_ms_per_page"]
+
+    for stage in REPORT_STAGES:
+        if stage in stages:
+            print(f"    {stage:<24} {stages[stage]:9.3f} ms/page")
+
+    extract = sum(v for k, v in stages.items() if k.startswith("extract.") and k != "extract.INLINE")
+    print(f"    {'extract (tables)':<24} {extract:9.3f} ms/page")
+
+
+# ==================================================
+# CLI
+# ==================================================
+def main():
+    parser = argparse.ArgumentParser(description="End-to-end pipeline benchmark")
+    parser.add_argument("--pages", type=int, default=64, help="synthetic manual length")
+    parser.add_argument("--rows", type=int, nargs="+", default=[25], help="rows per table page")
+    parser.add_argument("--layouts", nargs="+", choices=list(LAYOUTS), default=None)
+    parser.add_argument("--engine", nargs="+", default=["pdfplumber"])
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=1, help="best of N runs per case")
+    parser.add_argument("--pdf", nargs="+", default=[], help="recorded manuals to include")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown / RSS growth")
+    args = parser.parse_args()
+
+    baselines = {}
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baselines = json.load(f)
+
+    results = []
+    regressions = 0
+
+    with tempfile.TemporaryDirectory() as fixture_dir:
+
+        cases = []
+
+        for rows in args.rows:
+            pdf_path = os.path.join(fixture_dir, f"synthetic-{rows}.pdf")
+            plan = build_manual(pdf_path, args.pages, rows=rows, layouts=args.layouts)
+            cases.append((f"synthetic-{args.pages}p-{rows}r", pdf_path, plan))
+
+        for pdf_path in args.pdf:
+            cases.append((os.path.basename(pdf_path), pdf_path, None))
+
+        for case_name, pdf_path, plan in cases:
+            for engine in args.engine:
+                name = f"{case_name}-{engine}-w{args.workers}"
+                result = run_case(name, pdf_path, engine, args.workers, args.repeat, plan)
+                baseline = baselines.get(name)
+
+                print_result(result, baseline)
+
+                for problem in compare(result, baseline, args.tolerance):
+                    regressions += 1
+                    print(f"  REGRESSION {problem}")
+
+                results.append(result)
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump({r["case"]: r for r in results}, f, indent=2)
+        print(f"\nBaseline written to {args.baseline}")
+
+    if regressions:
+        raise SystemExit(f"{regressions} regression(s)")
+
+
+if __name__ == "__main__":
+    main()
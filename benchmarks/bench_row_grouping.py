@@ -0,0 +1,110 @@
+"""
+Micro-benchmark: row grouping in step3_geometry_normalize.
+
+Compares the original "scan every existing row" grouping with the
+single-sweep _group_rows on synthetic dense parts-list pages, and
+checks both produce identical rows.
+
+Usage:
+    python -m benchmarks.bench_row_grouping [--words 3000] [--repeat 5]
+"""
+
+import argparse
+import random
+import time
+
+from multitable_inline.patterns import Y_TOL
+from multitable_inline.step3_geometry_normalize import _group_rows
+
+
+def _group_rows_scan_all(words):
+    # Reference implementation (pre-sweep normalize_table)
+    rows = []
+
+    for w in sorted(words, key=lambda x: x["top"]):
+
+        placed = False
+
+        for row in rows:
+            if abs(row["top"] - w["top"]) < Y_TOL:
+                row["words"].append(w)
+                placed = True
+                break
+
+        if not placed:
+            rows.append({
+                "top": w["top"],
+                "words": [w]
+            })
+
+    return rows
+
+
+def synthetic_page(n_words, seed=0, row_pitch=9.5, jitter=1.5):
+    """
+    Dense parts-list page: ~10 words per row, tops jittered around the
+    row baseline so some rows sit close to the Y_TOL boundary.
+    """
+    rnd = random.Random(seed)
+    words = []
+    per_row = 10
+
+    for i in range(n_words):
+        row = i // per_row
+        col = i % per_row
+        top = 40 + row * row_pitch + rnd.uniform(-jitter, jitter)
+        x0 = 30 + col * 55 + rnd.uniform(-2, 2)
+
+        words.append({
+            "text": f"W{i}",
+            "x0": x0,
+            "x1": x0 + 40,
+            "top": top,
+            "bottom": top + 8,
+        })
+
+    rnd.shuffle(words)
+    return words
+
+
+def _rows_key(rows):
+    return [(r["top"], [w["text"] for w in r["words"]]) for r in rows]
+
+
+def _time(fn, words, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn(words)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--words", type=int, nargs="+", default=[500, 1000, 3000, 5000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'words':>7} {'rows':>6} {'scan-all ms':>12} {'sweep ms':>10} {'speedup':>8}  identical")
+
+    for n in args.words:
+        for seed in range(3):
+            words = synthetic_page(n, seed=seed)
+
+            identical = _rows_key(_group_rows_scan_all(words)) == _rows_key(_group_rows(words))
+            if not identical:
+                raise SystemExit(f"Row output differs for {n} words (seed {seed})")
+
+        old = _time(_group_rows_scan_all, words, args.repeat)
+        new = _time(_group_rows, words, args.repeat)
+        n_rows = len(_group_rows(words))
+
+        print(
+            f"{n:>7} {n_rows:>6} {old * 1000:>12.2f} {new * 1000:>10.2f} "
+            f"{old / new:>7.1f}x  {identical}"
+        )
+
+
+if __name__ == "__main__":
+    main()
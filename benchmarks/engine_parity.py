@@ -0,0 +1,101 @@
+"""
+Parity check: step 1 word-extraction engines.
+
+Runs every page of each PDF through both engines (pdfplumber and
+pymupdf) and compares, per page, the table type picked by
+classify_page and the extracted (part_no, description) records.
+Also reports step 1 time per engine. Exits non-zero on any mismatch.
+
+Usage:
+    python -m benchmarks.engine_parity manual.pdf [more.pdf ...] [--pages 3 4 5]
+"""
+
+import argparse
+import time
+
+from multitable_inline.step1_extract_tables import ENGINES, iter_page_candidates
+from multitable_inline.step3_geometry_normalize import PageGeometry
+from multitable_inline.table_types import classify_page
+from run_pipeline import extract_page_parts
+
+
+REFERENCE = "pdfplumber"
+
+
+def _page_results(pdf_path, engine, page_numbers=None):
+    """
+    {page: (table type, [(part_no, description), ...])} and the time
+    spent in step 1 alone.
+    """
+
+    t0 = time.perf_counter()
+    pages = list(iter_page_candidates(pdf_path, page_numbers=page_numbers, engine=engine))
+    step1 = time.perf_counter() - t0
+
+    results = {}
+
+    for page_data in pages:
+        table_type = classify_page(page_data, PageGeometry(page_data))
+        parts = extract_page_parts(page_data)
+
+        results[page_data["page"]] = (
+            table_type.name if table_type else "INLINE",
+            [(p.get("part_no"), p.get("description")) for p in parts]
+        )
+
+    return results, step1
+
+
+def compare(pdf_path, page_numbers=None):
+    reference, ref_time = _page_results(pdf_path, REFERENCE, page_numbers)
+    mismatches = 0
+
+    print(f"\n{pdf_path}")
+    print(f"  {REFERENCE:<12} step1 {ref_time:7.2f}s  pages {len(reference)}")
+
+    for engine in ENGINES:
+        if engine == REFERENCE:
+            continue
+
+        other, other_time = _page_results(pdf_path, engine, page_numbers)
+
+        print(
+            f"  {engine:<12} step1 {other_time:7.2f}s  pages {len(other)}"
+            f"  ({ref_time / max(other_time, 1e-9):.1f}x)"
+        )
+
+        for page in sorted(set(reference) | set(other)):
+            ref_type, ref_parts = reference.get(page, (None, []))
+            got_type, got_parts = other.get(page, (None, []))
+
+            if ref_type != got_type:
+                mismatches += 1
+                print(f"    page {page}: type {ref_type} != {got_type}")
+
+            elif ref_parts != got_parts:
+                mismatches += 1
+                missing = [p for p in ref_parts if p not in got_parts]
+                extra = [p for p in got_parts if p not in ref_parts]
+                print(
+                    f"    page {page}: parts {len(ref_parts)} != {len(got_parts)}"
+                    f"  missing {missing[:3]} extra {extra[:3]}"
+                )
+
+    print(f"  mismatching pages: {mismatches}")
+    return mismatches
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("pdfs", nargs="+")
+    parser.add_argument("--pages", type=int, nargs="+", default=None)
+    args = parser.parse_args()
+
+    total = sum(compare(pdf, args.pages) for pdf in args.pdfs)
+
+    if total:
+        raise SystemExit(f"{total} page(s) differ between engines")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,318 @@
+"""
+Synthetic manual generator for the benchmarks.
+
+Each layout draws one page of a supported table type with PyMuPDF.
+LAYOUTS maps a layout name to (builder, expected table type), where
+the table type is the TableType name classify_page should pick
+("INLINE" for pages that fall through to inline P/N extraction).
+
+Usage:
+    python -m benchmarks.fixtures out.pdf --pages 40 [--rows 25] [--layouts mark pmh]
+"""
+
+import argparse
+
+import fitz  # PyMuPDF
+
+
+PAGE_WIDTH = 612
+PAGE_HEIGHT = 792
+ROW_PITCH = 14
+
+
+def _put(page, x, y, text, size=9, bold=False):
+    page.insert_text((x, y), text, fontsize=size, fontname="hebo" if bold else "helv")
+
+
+def _title(page, text, y=60):
+    _put(page, 60, y, text, size=16, bold=True)
+
+
+def _header(page, cells, y):
+    for x, text in cells:
+        _put(page, x, y, text)
+
+
+def _row_ys(n_rows, y0):
+    # Rows stop above the footer band
+    last = PAGE_HEIGHT - 60
+    return [y0 + ROW_PITCH * (i + 1) for i in range(n_rows) if y0 + ROW_PITCH * (i + 1) < last]
+
+
+# ==================================================
+# LAYOUTS
+# ==================================================
+def mark(page, n):
+    _title(page, "HYDRAULIC POWER UNIT ASSEMBLY")
+    _header(page, [(40, "DWG"), (70, "NO"), (130, "REV"), (170, "QTY"),
+                   (220, "DESCRIPTION"), (420, "MARK"), (500, "WEIGHT")], 120)
+
+    for i, y in enumerate(_row_ys(n, 120)):
+        _put(page, 40, y, f"D{1000 + i}")
+        _put(page, 130, y, "A")
+        _put(page, 170, y, str(i % 4 + 1))
+        _put(page, 220, y, f"VALVE BODY SIZE {i}")
+        _put(page, 420, y, f"{10 + i % 80}N{600 + i}")
+        _put(page, 500, y, "1.2")
+
+
+def pos_item(page, n):
+    _put(page, 40, 40, "DrawNumber")
+    _put(page, 110, 40, "D5512-77")
+    _put(page, 40, 60, "DrawingName")
+    _put(page, 300, 60, "DrawingRevision")
+    _put(page, 40, 80, "WINCH DRUM ASSEMBLY", size=11)
+    _header(page, [(40, "POS"), (80, "QTY"), (120, "ITEM NAME"),
+                   (300, "ITEM NO"), (420, "DRAWING REFERENCE")], 120)
+
+    for i, y in enumerate(_row_ys(n, 120)):
+        _put(page, 40, y, str(i + 1))
+        _put(page, 80, y, "1")
+        _put(page, 120, y, f"PIN SHAFT {i}")
+        _put(page, 300, y, f"{700000 + i}")
+        _put(page, 420, y, f"D{5500 + i}-1")
+
+
+def simple_3col(page, n):
+    _title(page, "COMPRESSOR SPARE PARTS LIST")
+    _header(page, [(40, "QTY"), (100, "PART NUMBER"), (260, "DESCRIPTION")], 120)
+
+    for i, y in enumerate(_row_ys(n, 120)):
+        _put(page, 40, y, str(i % 3 + 1))
+        _put(page, 100, y, f"{220000 + i * 7}")
+        _put(page, 260, y, f"GASKET RING TYPE {i}")
+
+
+def component_list(page, n):
+    _title(page, "COMPONENT LIST")
+    _header(page, [(40, "Level"), (90, "Material"), (190, "Disc."),
+                   (250, "BOM"), (285, "item"), (330, "Description"), (500, "Remarks")], 120)
+
+    for i, y in enumerate(_row_ys(n, 120)):
+        _put(page, 40, y, f".{i % 3 + 1}")
+        _put(page, 90, y, f"{4100000 + i * 17}")
+        _put(page, 190, y, f"{88000 + i}")
+        _put(page, 250, y, f"{(i + 1) * 10}")
+        _put(page, 330, y, f"Hex bolt M{8 + i % 8}")
+        _put(page, 500, y, "-")
+
+
+def alt_id(page, n):
+    _put(page, 40, 40, "DrawingName")
+    _put(page, 300, 40, "DrawingRevision")
+    _put(page, 40, 58, "ANCHOR HANDLING WINCH", size=11)
+    _put(page, 40, 90, "DrawingNo:")
+    _put(page, 110, 90, "D7710-3")
+    _header(page, [(40, "Pos"), (80, "Part No."), (160, "Alternate ID"),
+                   (300, "Tag No"), (420, "Drawing Reference")], 120)
+
+    # Identifier row followed by a stacked description row
+    ys = _row_ys(n, 120)
+
+    for i in range(0, len(ys) - 1, 2):
+        k = i // 2
+        _put(page, 40, ys[i], str(k + 1))
+        _put(page, 80, ys[i], f"{9100000 + k * 3}")
+        _put(page, 300, ys[i], f"T{k}")
+        _put(page, 420, ys[i], f"D{6600 + k}-2")
+        _put(page, 80, ys[i + 1], f"BRAKE BAND LINING {k}")
+
+
+def simple_2col(page, n):
+    _title(page, "ELECTRICAL SPARES")
+    _header(page, [(60, "PART NUMBER"), (300, "DESCRIPTION")], 120)
+
+    for i, y in enumerate(_row_ys(n, 120)):
+        _put(page, 60, y, f"{330000 + i * 3}")
+        _put(page, 300, y, f"RELAY CONTACT BLOCK {i}")
+
+
+def pos_draw(page, n):
+    _put(page, 40, 40, "DrawNumber")
+    _put(page, 110, 40, "D8120-4")
+    _put(page, 40, 60, "DocumentName")
+    _put(page, 300, 60, "DrawingRevision")
+    _put(page, 40, 78, "MOORING WINCH FRAME", size=11)
+    _header(page, [(40, "Pos"), (70, "Drawing"), (130, "Quantity"), (190, "Item"),
+                   (215, "name/technical"), (340, "Item"), (365, "No."), (450, "Supplier")], 120)
+
+    for i, y in enumerate(_row_ys(n, 120)):
+        _put(page, 40, y, str(i + 1))
+        _put(page, 70, y, f"D{8100 + i}")
+        _put(page, 130, y, str(i % 4 + 1))
+        _put(page, 190, y, f"FLANGE PLATE {i}")
+        _put(page, 340, y, f"{550000 + i * 9}")
+        _put(page, 450, y, "ACME")
+
+
+def article_number(page, n):
+    _title(page, "SPARE PARTS - HOSE ASSEMBLIES")
+    _header(page, [(40, "Pos."), (80, "Article"), (120, "number"), (220, "Description"),
+                   (420, "Qty"), (460, "Certificate"), (530, "No.")], 120)
+
+    for i, y in enumerate(_row_ys(n, 120)):
+        _put(page, 40, y, str(i + 1))
+        _put(page, 80, y, f"H{i % 9 + 1}-{4000 + i}-{100 + i}")
+        _put(page, 220, y, f"HOSE ASSY DN{10 + i % 40}")
+        _put(page, 420, y, str(i % 3 + 1))
+        _put(page, 460, y, "3.1")
+        _put(page, 530, y, f"{i + 1}")
+
+
+def single_level_bom(page, n):
+    _put(page, 40, 60, "Description: FUEL INJECTION PUMP")
+    _header(page, [(40, "Item"), (100, "Component")], 106)
+    _header(page, [(40, "No."), (100, "item"), (170, "Rev"), (220, "Description"),
+                   (440, "M"), (470, "Qty")], 120)
+
+    for i, y in enumerate(_row_ys(n, 120)):
+        _put(page, 40, y, str(i + 1))
+        _put(page, 100, y, f"{610000 + i * 5}")
+        _put(page, 170, y, "B")
+        _put(page, 220, y, f"PLUNGER SPRING {i}")
+        _put(page, 440, y, "P")
+        _put(page, 470, y, str(i % 3 + 1))
+
+
+def split_header(page, n):
+    _title(page, "GEAR PUMP SPARES")
+    # Rows more than 20pt apart, so normalize_table keeps them separate
+    _header(page, [(40, "Item"), (110, "Part")], 96)
+    _header(page, [(40, "Number"), (110, "Number"), (200, "Qty."), (250, "Description")], 120)
+
+    for i, y in enumerate(_row_ys(n, 120)):
+        _put(page, 40, y, str(i + 1))
+        _put(page, 110, y, f"{5800 + i}-{100 + i}")
+        _put(page, 200, y, str(i % 4 + 1))
+        _put(page, 250, y, f"DRIVE GEAR SHAFT {i}")
+
+
+def balloon_bom(page, n):
+    _put(page, 40, 60, "Description: STERN TUBE SEAL")
+    _header(page, [(40, "Balloon"), (110, "Part")], 106)
+    _header(page, [(40, "Number"), (110, "Number"), (200, "Rev"), (240, "Description"),
+                   (460, "M"), (490, "Qty")], 120)
+
+    for i, y in enumerate(_row_ys(n, 120)):
+        _put(page, 40, y, str(i + 1))
+        _put(page, 110, y, f"{7200000 + i * 3}")
+        _put(page, 200, y, "C")
+        _put(page, 240, y, f"LIP SEAL RING {i}")
+        _put(page, 460, y, "P")
+        _put(page, 490, y, str(i % 3 + 1))
+
+
+def recommended_spares(page, n):
+    _put(page, 40, 80, "RECOMMENDED SPARES", size=11)
+    _header(page, [(40, "Parts"), (70, "List"), (100, "Item"), (140, "Qty"),
+                   (180, "Description"), (380, "PMH"), (410, "Part"), (440, "No")], 120)
+    _header(page, [(520, "Weight")], 134)
+
+    for i, y in enumerate(_row_ys(n, 134)):
+        _put(page, 40, y, f"PL{i % 5 + 1}")
+        _put(page, 100, y, str(i + 1))
+        _put(page, 140, y, str(i % 3 + 1))
+        _put(page, 180, y, f"ORING SEAL KIT {i}")
+        _put(page, 380, y, f"PMH-{5100 + i}")
+        _put(page, 520, y, "0.4")
+
+
+def pmh_mos(page, n):
+    _put(page, 40, 100, "COOLING WATER PUMP")
+    _header(page, [(40, "ITEM"), (80, "QTY"), (120, "DESCRIPTION"), (320, "PMH"),
+                   (350, "PART"), (390, "NO"), (460, "MATERIAL")], 120)
+
+    for i, y in enumerate(_row_ys(n, 120)):
+        _put(page, 40, y, str(i + 1))
+        _put(page, 80, y, "2")
+        _put(page, 120, y, f"COUPLING HALF {i}")
+        _put(page, 320, y, f"PMH-{4400 + i}")
+        _put(page, 460, y, "STEEL")
+
+
+def normal(page, n):
+    _title(page, "GEARBOX COMPONENTS")
+    _header(page, [(40, "ITEM"), (100, "PART NO."), (220, "DESCRIPTION"), (460, "QTY")], 120)
+
+    for i, y in enumerate(_row_ys(n, 120)):
+        _put(page, 40, y, str(i + 1))
+        _put(page, 100, y, f"{500000 + i * 13}")
+        _put(page, 220, y, f"BEARING SEAL KIT {i}")
+        _put(page, 460, y, str(i % 5 + 1))
+
+
+def inline(page, n):
+    _title(page, "MAINTENANCE PROCEDURES")
+
+    for i, y in enumerate(_row_ys(n, 100)):
+        _put(page, 40, y, f"Replace the filter element (P/N {880000 + i}). Check seals.")
+
+
+def prose(page, n):
+    _title(page, "SECTION 4 OVERVIEW OF SPARES")
+
+    for i, y in enumerate(_row_ys(n, 100)):
+        _put(page, 40, y, "General text describing the system with no part data here")
+
+
+# name → (builder, table type classify_page should pick)
+LAYOUTS = {
+    "mark": (mark, "MARK"),
+    "pos_item": (pos_item, "POS-ITEM"),
+    "simple_3col": (simple_3col, "SIMPLE 3COL"),
+    "component_list": (component_list, "COMPONENT LIST"),
+    "alt_id": (alt_id, "ALT-ID"),
+    "simple_2col": (simple_2col, "SIMPLE 2COL"),
+    "pos_draw": (pos_draw, "POS-DRAW"),
+    "article_number": (article_number, "ARTICLE-NUMBER"),
+    "single_level_bom": (single_level_bom, "SINGLE LEVEL BOM"),
+    "split_header": (split_header, "SPLIT HEADER"),
+    "balloon_bom": (balloon_bom, "BALLOON BOM"),
+    "recommended_spares": (recommended_spares, "RECOMMENDED SPARES"),
+    "pmh_mos": (pmh_mos, "PMH/MOS"),
+    "normal": (normal, "NORMAL"),
+    "inline": (inline, "INLINE"),
+    "prose": (prose, "INLINE"),
+}
+
+
+def build_manual(path, pages, rows=25, layouts=None, vendor_line="QUINCY QR-370LS Manual"):
+    """
+    Write a synthetic manual: pages cycle through layouts (all by
+    default), rows is the table density per page. Returns the list of
+    layout names, one per page.
+    """
+
+    names = list(layouts or LAYOUTS)
+
+    doc = fitz.open()
+    plan = []
+
+    for p in range(pages):
+        name = names[p % len(names)]
+        page = doc.new_page(width=PAGE_WIDTH, height=PAGE_HEIGHT)
+
+        _put(page, 40, PAGE_HEIGHT - 22, vendor_line if p == 0 else f"Page {p + 1}")
+        LAYOUTS[name][0](page, rows)
+
+        plan.append(name)
+
+    doc.save(path)
+    doc.close()
+
+    return plan
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("path")
+    parser.add_argument("--pages", type=int, default=len(LAYOUTS))
+    parser.add_argument("--rows", type=int, default=25)
+    parser.add_argument("--layouts", nargs="+", choices=list(LAYOUTS), default=None)
+    args = parser.parse_args()
+
+    build_manual(args.path, args.pages, rows=args.rows, layouts=args.layouts)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Parity check: derived page_text vs pdfplumber's extract_text().
+
+Step 1 rebuilds page_text from the extracted words (words_to_text)
+instead of calling extract_text(); the keyword gates in step 2 and the
+table types read it. This compares the two, line by line, on every
+page of each PDF (use real manuals - PDFs drawn in reading order don't
+exercise the out-of-order joins) and prints the first differing lines.
+Exits non-zero on any mismatching page.
+
+Usage:
+    python -m benchmarks.text_parity manual.pdf [more.pdf ...] [--pages 3 4 5] [--engine pymupdf]
+"""
+
+import argparse
+
+import pdfplumber
+
+from multitable_inline.step1_extract_tables import iter_page_candidates
+
+
+def compare(pdf_path, page_numbers=None, engine=None, show=3):
+    with pdfplumber.open(pdf_path) as pdf:
+        reference = {
+            page.page_number: page.extract_text()
+            for page in pdf.pages
+            if page_numbers is None or page.page_number in page_numbers
+        }
+
+    mismatches = 0
+    lines = same_lines = 0
+
+    for page_data in iter_page_candidates(pdf_path, page_numbers=page_numbers, engine=engine):
+        ref_lines = reference[page_data["page"]].splitlines()
+        got_lines = page_data["page_text"].splitlines()
+
+        lines += len(ref_lines)
+        same_lines += sum(a == b for a, b in zip(ref_lines, got_lines))
+
+        if ref_lines == got_lines:
+            continue
+
+        mismatches += 1
+        diffs = [(a, b) for a, b in zip(ref_lines, got_lines) if a != b]
+
+        print(f"  page {page_data['page']}: {len(ref_lines)} / {len(got_lines)} lines")
+        for a, b in diffs[:show]:
+            print(f"    extract_text  {a!r}")
+            print(f"    page_text     {b!r}")
+
+    print(f"{pdf_path}: {mismatches} mismatching page(s), lines {same_lines}/{lines} identical")
+    return mismatches
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("pdfs", nargs="+")
+    parser.add_argument("--pages", type=int, nargs="+", default=None)
+    parser.add_argument("--engine", default=None)
+    args = parser.parse_args()
+
+    pages = set(args.pages) if args.pages else None
+    total = sum(compare(pdf, pages, args.engine) for pdf in args.pdfs)
+
+    if total:
+        raise SystemExit(f"{total} page(s) differ from extract_text()")
+
+
+if __name__ == "__main__":
+    main()
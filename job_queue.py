@@ -0,0 +1,453 @@
+"""
+Background extraction jobs for the Streamlit app.
+
+A job is one run() call executed on a local process pool. Its state
+lives in <root>/<job_id>/job.json (status, per-page progress, output
+path, error), rewritten atomically as the job advances, so any session
+- including one reconnecting after a browser refresh - can look a job
+up by its ID and fetch the result.
+
+Each job also gets its own working directory (<root>/<job_id>) for
+the uploaded PDF and the outputs. Finished jobs expire after max_age
+seconds, and the oldest finished jobs are evicted when a new upload
+would take the directory over its disk quota.
+
+Statuses: queued → running → done | failed | cancelled.
+"""
+
+import json
+import os
+import shutil
+import threading
+import time
+import traceback
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+
+JOB_FILE = "job.json"
+
+# Its presence asks the job to stop (checked between pages)
+CANCEL_FILE = "cancel"
+
+# Progress is persisted at most this often (plus once at the end)
+PROGRESS_WRITE_INTERVAL = 0.5
+
+UNFINISHED = ("queued", "running")
+
+# A dead worker takes the whole pool (and every running job) down, so
+# a running job may only have been collateral: it is retried this often
+CRASH_RETRIES = 1
+
+# Uploads are copied to disk in chunks of this size
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+DEFAULT_QUOTA_BYTES = 5 * 1024 ** 3
+DEFAULT_MAX_AGE = 24 * 3600
+
+
+class QuotaExceeded(Exception):
+    """The jobs directory has no room for an upload, even after evicting finished jobs."""
+
+
+def _job_path(job_dir):
+    return os.path.join(job_dir, JOB_FILE)
+
+
+def read_job(job_dir):
+    try:
+        with open(_job_path(job_dir), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def write_job(job_dir, job):
+    # Readers never see a half-written file
+    path = _job_path(job_dir)
+    tmp = path + f".{os.getpid()}.tmp"
+
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(job, f, indent=2)
+
+    os.replace(tmp, path)
+
+
+def _dir_size(path):
+    total = 0
+
+    for base, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(base, name))
+            except OSError:
+                pass
+
+    return total
+
+
+def _update_job(job_dir, job, **fields):
+    job.update(fields, updated=time.time())
+    write_job(job_dir, job)
+
+
+class CancelFlag:
+    """Cancel token for run() that works across processes: a flag file."""
+
+    def __init__(self, job_dir):
+        self.path = os.path.join(job_dir, CANCEL_FILE)
+
+    def set(self):
+        open(self.path, "w").close()
+
+    def is_set(self):
+        return os.path.exists(self.path)
+
+
+# ==================================================
+# WORKER SIDE
+# ==================================================
+def _execute_job(job_dir):
+    """Runs one job in a pool process; all state goes through job.json."""
+
+    # Imported here so the app process doesn't need the pipeline loaded
+    from multitable_inline.result_cache import ResultCache
+    from run_pipeline import PipelineCancelled, run
+
+    job = read_job(job_dir)
+    params = dict(job["params"])
+    cancel = CancelFlag(job_dir)
+
+    # Cancelled while still queued
+    if cancel.is_set():
+        _update_job(job_dir, job, status="cancelled", finished=time.time())
+        return
+
+    _update_job(job_dir, job, status="running", started=time.time())
+
+    last_write = 0.0
+
+    def progress(pages_done, total_pages, parts, table_mode):
+        nonlocal last_write
+
+        job["progress"] = {
+            "pages_done": pages_done,
+            "total_pages": total_pages,
+            "parts": parts,
+            "table_mode": table_mode,
+        }
+
+        now = time.monotonic()
+        if now - last_write >= PROGRESS_WRITE_INTERVAL or pages_done == total_pages:
+            last_write = now
+            _update_job(job_dir, job)
+
+    try:
+        use_cache = params.pop("use_cache", False)
+
+        output = run(
+            **params,
+            cache=ResultCache() if use_cache else None,
+            progress=progress,
+            cancel=cancel
+        )
+
+    except PipelineCancelled:
+        _update_job(job_dir, job, status="cancelled", finished=time.time())
+        return
+
+    except Exception as e:
+        _update_job(
+            job_dir,
+            job,
+            status="failed",
+            error=f"{type(e).__name__}: {e}",
+            traceback=traceback.format_exc(),
+            finished=time.time()
+        )
+        return
+
+    _update_job(job_dir, job, status="done", output=output, finished=time.time())
+
+
+# ==================================================
+# JOB QUEUE
+# ==================================================
+class JobQueue:
+    """
+    Local background job queue. One instance per server process,
+    shared by every session:
+
+        queue = JobQueue("/tmp/parts_jobs", workers=2)
+
+        job_id = queue.new_job(upload_size)
+        pdf_path = queue.save_upload(job_id, uploaded_file, "manual.pdf")
+        queue.submit(job_id=job_id, pdf_path=pdf_path, output_csv=queue.output_path(job_id, "manual.pdf"))
+
+        queue.status(job_id)   # {"status": "running", "progress": {...}, ...}
+
+    Jobs left queued or running by a previous server process are
+    marked failed on start-up.
+
+    If a worker process dies (killed, out of memory), the pool is
+    replaced and its jobs are queued again on the new one; a job that
+    was already running gets CRASH_RETRIES retries before it fails.
+    """
+
+    def __init__(self, root, workers=2, quota_bytes=DEFAULT_QUOTA_BYTES, max_age=DEFAULT_MAX_AGE):
+        self.root = root
+        self.workers = workers
+        self.quota_bytes = quota_bytes
+        self.max_age = max_age
+
+        os.makedirs(root, exist_ok=True)
+        self._recover()
+        self.cleanup()
+
+        self._pool_lock = threading.Lock()
+        self._pool = ProcessPoolExecutor(max_workers=workers)
+
+    def _recover(self):
+        for job_id in os.listdir(self.root):
+            job_dir = os.path.join(self.root, job_id)
+            job = read_job(job_dir)
+
+            if job and job["status"] in UNFINISHED:
+                _update_job(
+                    job_dir,
+                    job,
+                    status="failed",
+                    error="Interrupted: the server restarted before the job finished",
+                    finished=time.time()
+                )
+
+    def job_dir(self, job_id):
+        return os.path.join(self.root, job_id)
+
+    # ----------------------------------------------
+    # Working directories, quota, cleanup
+    # ----------------------------------------------
+    def _remove(self, job_id):
+        shutil.rmtree(self.job_dir(job_id), ignore_errors=True)
+
+    def cleanup(self):
+        """
+        Remove finished jobs older than max_age, and working
+        directories of uploads that never became a job.
+        """
+
+        now = time.time()
+
+        for job_id in os.listdir(self.root):
+            job_dir = self.job_dir(job_id)
+            job = read_job(job_dir)
+
+            if job is None:
+                try:
+                    expired = now - os.path.getmtime(job_dir) > self.max_age
+                except OSError:
+                    continue
+            else:
+                expired = job["status"] not in UNFINISHED and now - job.get("finished", now) > self.max_age
+
+            if expired:
+                self._remove(job_id)
+
+    def disk_usage(self):
+        return _dir_size(self.root)
+
+    def _make_room(self, needed):
+        if self.quota_bytes is None:
+            return
+
+        usage = self.disk_usage()
+
+        if usage + needed <= self.quota_bytes:
+            return
+
+        message = (
+            f"Upload of {needed / 1024 ** 2:.0f} MB does not fit the "
+            f"{self.quota_bytes / 1024 ** 2:.0f} MB job quota"
+        )
+
+        # Evicting can't help an upload bigger than the whole quota
+        if needed > self.quota_bytes:
+            raise QuotaExceeded(message)
+
+        finished = sorted(
+            (j for j in self.jobs() if j["status"] not in UNFINISHED),
+            key=lambda j: j.get("finished", j["created"])
+        )
+
+        for job in finished:
+            usage -= _dir_size(self.job_dir(job["id"]))
+            self._remove(job["id"])
+
+            if usage + needed <= self.quota_bytes:
+                return
+
+        raise QuotaExceeded(message + "; try again when running jobs finish")
+
+    def new_job(self, upload_size=0):
+        """
+        Reserve a job ID and its working directory for an upload of
+        upload_size bytes. Raises QuotaExceeded when it can't fit.
+        """
+
+        self.cleanup()
+        self._make_room(upload_size)
+
+        job_id = uuid.uuid4().hex[:12]
+        os.makedirs(self.job_dir(job_id))
+
+        return job_id
+
+    def save_upload(self, job_id, fileobj, filename):
+        """
+        Stream an uploaded file object into the job's directory in
+        UPLOAD_CHUNK_SIZE chunks. Returns the saved path.
+        """
+
+        name = os.path.basename(filename or "") or "upload.pdf"
+        path = os.path.join(self.job_dir(job_id), name)
+
+        fileobj.seek(0)
+
+        with open(path, "wb") as f:
+            shutil.copyfileobj(fileobj, f, UPLOAD_CHUNK_SIZE)
+
+        return path
+
+    def output_path(self, job_id, filename):
+        """Output base path (run()'s output_csv) inside the job's directory."""
+
+        stem = os.path.splitext(os.path.basename(filename or ""))[0] or "parts"
+        return os.path.join(self.job_dir(job_id), stem + ".csv")
+
+    def submit(self, label=None, job_id=None, **params):
+        """
+        Queue run(**params) (use_cache=True adds a ResultCache).
+        params must be JSON-serializable. job_id is one from
+        new_job(); without it a fresh job is created. Returns the
+        job ID.
+        """
+
+        if job_id is None:
+            job_id = self.new_job()
+
+        job_dir = self.job_dir(job_id)
+
+        write_job(job_dir, {
+            "id": job_id,
+            "label": label or os.path.basename(params.get("pdf_path", "")),
+            "status": "queued",
+            "params": params,
+            "progress": None,
+            "output": None,
+            "error": None,
+            "created": time.time(),
+            "updated": time.time(),
+        })
+
+        self._enqueue(job_dir)
+
+        return job_id
+
+    # ----------------------------------------------
+    # Process pool
+    # ----------------------------------------------
+    def _replace_pool(self, broken):
+        # One dead worker breaks the whole executor for good
+        with self._pool_lock:
+            if self._pool is broken:
+                broken.shutdown(wait=False)
+                self._pool = ProcessPoolExecutor(max_workers=self.workers)
+
+    def _enqueue(self, job_dir):
+        """Hand a queued job to the pool; marks it failed if that's impossible."""
+
+        error = None
+
+        # A broken pool is replaced once and the job retried
+        for _ in range(2):
+            pool = self._pool
+
+            try:
+                future = pool.submit(_execute_job, job_dir)
+            except BrokenProcessPool as e:
+                error = e
+                self._replace_pool(pool)
+                continue
+            except RuntimeError as e:
+                # Shut down by another thread replacing it just now
+                error = e
+                if pool is not self._pool:
+                    continue
+                break
+
+            future.add_done_callback(lambda f: self._check_crashed(job_dir, pool, f))
+            return
+
+        job = read_job(job_dir)
+        if job:
+            _update_job(job_dir, job, status="failed", error=f"Could not start job: {error}", finished=time.time())
+
+    def _check_crashed(self, job_dir, pool, future):
+        # A worker that died (e.g. killed, out of memory) never wrote its end state
+        error = future.exception()
+
+        if error is None:
+            return
+
+        if isinstance(error, BrokenProcessPool):
+            self._replace_pool(pool)
+
+        job = read_job(job_dir)
+
+        if not job or job["status"] not in UNFINISHED:
+            return
+
+        if isinstance(error, BrokenProcessPool):
+            # Still waiting when the pool went down: it never ran
+            if job["status"] == "queued":
+                self._enqueue(job_dir)
+                return
+
+            retries = job.get("retries", 0)
+
+            if retries < CRASH_RETRIES:
+                _update_job(job_dir, job, status="queued", progress=None, retries=retries + 1)
+                self._enqueue(job_dir)
+                return
+
+        _update_job(job_dir, job, status="failed", error=f"Worker crashed: {error}", finished=time.time())
+
+    def cancel(self, job_id):
+        """Ask a queued or running job to stop. Returns False if it already finished."""
+
+        job = self.status(job_id)
+
+        if not job or job["status"] not in UNFINISHED:
+            return False
+
+        CancelFlag(self.job_dir(job_id)).set()
+        return True
+
+    def status(self, job_id):
+        """The job's persisted state, or None for an unknown ID."""
+
+        # IDs come from users (URL, text box); keep them inside root
+        if not job_id or not job_id.isalnum():
+            return None
+
+        return read_job(self.job_dir(job_id))
+
+    def jobs(self):
+        """Every known job, newest first."""
+
+        jobs = [read_job(self.job_dir(job_id)) for job_id in os.listdir(self.root)]
+        return sorted((j for j in jobs if j), key=lambda j: -j["created"])
+
+    def shutdown(self, wait=True):
+        self._pool.shutdown(wait=wait)
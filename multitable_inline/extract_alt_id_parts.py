@@ -1,5 +1,7 @@
 import re
 
+from multitable_inline.spatial_index import word_index
+
 # -------------------------------------------------
 # IDENTIFIER REGEXES
 # -------------------------------------------------
@@ -116,15 +118,18 @@ def _extract_alt_id_structural_title(normalized_table):
     # -------------------------------------------------
     # 5️⃣ Collect words inside rectangle
     # -------------------------------------------------
-    title_words = []
-
-    for row in rows:
-        for w in row["words"]:
-            if (
-                LEFT <= w["x0"] <= RIGHT
-                and TOP <= w["top"] <= BOTTOM
-            ):
-                title_words.append(w)
+    title_words = [
+        w for w in word_index(normalized_table).search(
+            left=LEFT,
+            right=RIGHT,
+            top=TOP,
+            bottom=BOTTOM
+        )
+        if (
+            LEFT <= w["x0"] <= RIGHT
+            and TOP <= w["top"] <= BOTTOM
+        )
+    ]
 
     if not title_words:
         return None, []
@@ -341,26 +346,8 @@ def extract_alt_id_parts(normalized_table, debug=False):
             # ---- DEBUG TRACE FOR OVERLAY PDF ----
             if debug:
                 trace = {
-                    "pn_boxes": [
-                        {
-                            "text": w["text"],
-                            "x0": w["x0"],
-                            "x1": w["x1"],
-                            "top": w["top"],
-                            "bottom": w["bottom"],
-                        }
-                        for w in id_words
-                    ],
-                    "desc_boxes": [
-                        {
-                            "text": w["text"],
-                            "x0": w["x0"],
-                            "x1": w["x1"],
-                            "top": w["top"],
-                            "bottom": w["bottom"],
-                        }
-                        for w in desc_words
-                    ]
+                    "pn_boxes": list(id_words),
+                    "desc_boxes": list(desc_words)
                 }
             
                 # 🔶 ADD DRAWING NUMBER BOX (YELLOW)
@@ -368,16 +355,7 @@ def extract_alt_id_parts(normalized_table, debug=False):
                     trace["drawing_box"] = drawing_box
                  # 🔴 ADD TITLE BOXES  ← ADD IT HERE
                 if table_title and title_words:
-                    trace["title_boxes"] = [
-                        {
-                            "text": w["text"],
-                            "x0": w["x0"],
-                            "x1": w["x1"],
-                            "top": w["top"],
-                            "bottom": w["bottom"],
-                        }
-                        for w in title_words
-                    ]
+                    trace["title_boxes"] = list(title_words)
             
                 entry["trace"] = trace
 
@@ -143,26 +143,8 @@ def extract_article_number_table(normalized_table, debug=False):
 
                 if debug:
                     entry["trace"] = {
-                        "pn_boxes": [
-                            {
-                                "text": w["text"],
-                                "x0": w["x0"],
-                                "x1": w["x1"],
-                                "top": w["top"],
-                                "bottom": w["bottom"],
-                            }
-                            for w in current_pn_words.copy()
-                        ],
-                        "desc_boxes": [
-                            {
-                                "text": w["text"],
-                                "x0": w["x0"],
-                                "x1": w["x1"],
-                                "top": w["top"],
-                                "bottom": w["bottom"],
-                            }
-                            for w in current_desc_words.copy()
-                        ],
+                        "pn_boxes": list(current_pn_words),
+                        "desc_boxes": list(current_desc_words),
                     }
 
                 results.append(entry)
@@ -197,26 +179,8 @@ def extract_article_number_table(normalized_table, debug=False):
 
         if debug:
             entry["trace"] = {
-                "pn_boxes": [
-                    {
-                        "text": w["text"],
-                        "x0": w["x0"],
-                        "x1": w["x1"],
-                        "top": w["top"],
-                        "bottom": w["bottom"],
-                    }
-                    for w in current_pn_words.copy()
-                ],
-                "desc_boxes": [
-                    {
-                        "text": w["text"],
-                        "x0": w["x0"],
-                        "x1": w["x1"],
-                        "top": w["top"],
-                        "bottom": w["bottom"],
-                    }
-                    for w in current_desc_words.copy()
-                ],
+                "pn_boxes": list(current_pn_words),
+                "desc_boxes": list(current_desc_words),
             }
 
         results.append(entry)
@@ -166,37 +166,13 @@ def extract_balloon_bom_table(normalized_table, debug=False):
 
         if debug:
             trace = {
-                "pn_boxes": [{
-                    "text": pn_word["text"],
-                    "x0": pn_word["x0"],
-                    "x1": pn_word["x1"],
-                    "top": pn_word["top"],
-                    "bottom": pn_word["bottom"],
-                }],
-                "desc_boxes": [
-                    {
-                        "text": w["text"],
-                        "x0": w["x0"],
-                        "x1": w["x1"],
-                        "top": w["top"],
-                        "bottom": w["bottom"],
-                    }
-                    for w in desc_words
-                ]
+                "pn_boxes": [pn_word],
+                "desc_boxes": list(desc_words)
             }
 
             # 🔴 TITLE BOXES
             if section_title and title_words:
-                trace["title_boxes"] = [
-                    {
-                        "text": w["text"],
-                        "x0": w["x0"],
-                        "x1": w["x1"],
-                        "top": w["top"],
-                        "bottom": w["bottom"],
-                    }
-                    for w in title_words
-                ]
+                trace["title_boxes"] = list(title_words)
 
             entry["trace"] = trace
 
@@ -3,6 +3,8 @@ import re
 # Disc column should only emit real numeric PNs (no H14, H03 etc.)
 DISC_PN_REGEX = re.compile(r"^\d{5,}$")
 MATERIAL_PN_REGEX = re.compile(r"^[A-Z0-9]{4,}$")
+# Pure hierarchy rows like ".2", "..3"
+HIERARCHY_ROW_REGEX = re.compile(r"\.*\d+")
 
 def extract_component_list_table(normalized_table, debug=False):
     """
@@ -140,26 +142,8 @@ def extract_component_list_table(normalized_table, debug=False):
             "part_no": material_no,
             "description": description,
             "trace": {
-                "pn_boxes": [
-                    {
-                        "text": w["text"],
-                        "x0": w["x0"],
-                        "x1": w["x1"],
-                        "top": w["top"],
-                        "bottom": w["bottom"],
-                    }
-                    for w in current_material_words
-                ],
-                "desc_boxes": [
-                    {
-                        "text": w["text"],
-                        "x0": w["x0"],
-                        "x1": w["x1"],
-                        "top": w["top"],
-                        "bottom": w["bottom"],
-                    }
-                    for w in current_desc_words
-                ]
+                "pn_boxes": list(current_material_words),
+                "desc_boxes": list(current_desc_words)
             }
         })
     
@@ -176,26 +160,8 @@ def extract_component_list_table(normalized_table, debug=False):
                 "part_no": disc_no,
                 "description": description,
                 "trace": {
-                    "pn_boxes": [
-                        {
-                            "text": w["text"],
-                            "x0": w["x0"],
-                            "x1": w["x1"],
-                            "top": w["top"],
-                            "bottom": w["bottom"],
-                        }
-                        for w in current_disc_words
-                    ],
-                    "desc_boxes": [
-                        {
-                            "text": w["text"],
-                            "x0": w["x0"],
-                            "x1": w["x1"],
-                            "top": w["top"],
-                            "bottom": w["bottom"],
-                        }
-                        for w in current_desc_words
-                    ]
+                    "pn_boxes": list(current_disc_words),
+                    "desc_boxes": list(current_desc_words)
                 }
             })
     
@@ -221,7 +187,7 @@ def extract_component_list_table(normalized_table, debug=False):
 
 
         # Skip pure hierarchy rows like ".2", "..3"
-        if re.fullmatch(r"\.*\d+", row_text):
+        if HIERARCHY_ROW_REGEX.fullmatch(row_text):
             continue
 
         material_words = [
@@ -1,5 +1,7 @@
 import re
 
+from multitable_inline.spatial_index import word_index
+
 
 # Industrial MARK pattern like 15N642, 26C363, etc.
 MARK_PN_REGEX = re.compile(
@@ -178,6 +180,9 @@ def extract_mark_table(normalized_table, debug=False):
 
     if not mark_words:
         return results
+
+    # Band lookups go through the page's grid instead of all_words
+    index = word_index(normalized_table)
         
     # -------------------------------------------------
     # 5️⃣ EXTRACT USING CONTROLLED VERTICAL BANDS
@@ -199,9 +204,15 @@ def extract_mark_table(normalized_table, debug=False):
     
         # Collect candidate words in DESC column inside vertical band
         band_words = [
-            w for w in all_words
+            w for w in index.search(
+                left=desc_col_range[0],
+                right=desc_col_range[1],
+                top=current_top - 5,
+                bottom=next_top - 5
+            )
             if (
-                current_top - 5 <= w["top"] < next_top - 5
+                w["top"] > header_y
+                and current_top - 5 <= w["top"] < next_top - 5
                 and desc_col_range[0] <= w["x0"] <= desc_col_range[1]
             )
         ]
@@ -248,37 +259,13 @@ def extract_mark_table(normalized_table, debug=False):
 
         if debug:
             trace = {
-                "pn_boxes": [{
-                    "text": mark_w["text"],
-                    "x0": mark_w["x0"],
-                    "x1": mark_w["x1"],
-                    "top": mark_w["top"],
-                    "bottom": mark_w["bottom"],
-                }],
-                "desc_boxes": [
-                    {
-                        "text": w["text"],
-                        "x0": w["x0"],
-                        "x1": w["x1"],
-                        "top": w["top"],
-                        "bottom": w["bottom"],
-                    }
-                    for w in desc_words
-                ]
+                "pn_boxes": [mark_w],
+                "desc_boxes": list(desc_words)
             }
         
             # 🔴 TITLE BOXES
             if section_title and title_words:
-                trace["title_boxes"] = [
-                    {
-                        "text": w["text"],
-                        "x0": w["x0"],
-                        "x1": w["x1"],
-                        "top": w["top"],
-                        "bottom": w["bottom"],
-                    }
-                    for w in title_words
-                ]
+                trace["title_boxes"] = list(title_words)
         
             entry["trace"] = trace
 
@@ -179,11 +179,6 @@ def extract_multi_pn_table(normalized_table, debug=False):
                 # -------------------------------------------------
                 # 🔥 Emit band boxes for overlay
                 # -------------------------------------------------
-                band_height_top = min(w["top"] for w in words)
-                band_height_bottom = max(w["bottom"] for w in words)
-            
-                # PN band box
-
                 if debug:
 
                     band_height_top = min(w["top"] for w in words)
@@ -241,26 +236,8 @@ def extract_multi_pn_table(normalized_table, debug=False):
 
                 if debug:
                     entry["trace"] = {
-                        "pn_boxes": [
-                            {
-                                "text": w["text"],
-                                "x0": w["x0"],
-                                "x1": w["x1"],
-                                "top": w["top"],
-                                "bottom": w["bottom"],
-                            }
-                            for w in pn_words
-                        ],
-                        "desc_boxes": [
-                            {
-                                "text": w["text"],
-                                "x0": w["x0"],
-                                "x1": w["x1"],
-                                "top": w["top"],
-                                "bottom": w["bottom"],
-                            }
-                            for w in desc_words
-                        ]
+                        "pn_boxes": list(pn_words),
+                        "desc_boxes": list(desc_words)
                     }
 
                 results.append(entry)
@@ -242,26 +242,8 @@ def extract_pos_drawing_table(normalized_table, debug=False):
 
                 if debug:
                     entry["trace"] = {
-                        "pn_boxes": [
-                            {
-                                "text": w["text"],
-                                "x0": w["x0"],
-                                "x1": w["x1"],
-                                "top": w["top"],
-                                "bottom": w["bottom"],
-                            }
-                            for w in current_pn_words.copy()
-                        ],
-                        "desc_boxes": [
-                            {
-                                "text": w["text"],
-                                "x0": w["x0"],
-                                "x1": w["x1"],
-                                "top": w["top"],
-                                "bottom": w["bottom"],
-                            }
-                            for w in current_desc_words.copy()
-                        ]
+                        "pn_boxes": list(current_pn_words),
+                        "desc_boxes": list(current_desc_words)
                     }
 
                     if drawing_box:
@@ -298,26 +280,8 @@ def extract_pos_drawing_table(normalized_table, debug=False):
 
         if debug:
             entry["trace"] = {
-                "pn_boxes": [
-                    {
-                        "text": w["text"],
-                        "x0": w["x0"],
-                        "x1": w["x1"],
-                        "top": w["top"],
-                        "bottom": w["bottom"],
-                    }
-                    for w in current_pn_words.copy()
-                ],
-                "desc_boxes": [
-                    {
-                        "text": w["text"],
-                        "x0": w["x0"],
-                        "x1": w["x1"],
-                        "top": w["top"],
-                        "bottom": w["bottom"],
-                    }
-                    for w in current_desc_words.copy()
-                ]
+                "pn_boxes": list(current_pn_words),
+                "desc_boxes": list(current_desc_words)
             }
 
             # 🔶 Drawing number box
@@ -326,16 +290,7 @@ def extract_pos_drawing_table(normalized_table, debug=False):
 
             # 🔴 Title boxes (NEW)
             if table_title and title_words:
-                entry["trace"]["title_boxes"] = [
-                    {
-                        "text": w["text"],
-                        "x0": w["x0"],
-                        "x1": w["x1"],
-                        "top": w["top"],
-                        "bottom": w["bottom"],
-                    }
-                    for w in title_words
-                ]
+                entry["trace"]["title_boxes"] = list(title_words)
 
         results.append(entry)
 
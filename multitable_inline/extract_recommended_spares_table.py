@@ -1,5 +1,7 @@
 import re
 
+from multitable_inline.spatial_index import word_index
+
 PN_REGEX = re.compile(r"^[0-9A-Z\-]+$")
 
 def extract_recommended_spares_table(normalized_table, debug=False):
@@ -146,12 +148,19 @@ def extract_recommended_spares_table(normalized_table, debug=False):
     # -------------------------------------------------
     Y_THRESHOLD = 12
 
+    index = word_index(normalized_table)
+
     for pn_w in pn_words_all:
 
         pn_top = pn_w["top"]
 
         desc_words = [
-            w for w in all_words
+            w for w in index.search(
+                left=DESC_LEFT,
+                right=DESC_RIGHT,
+                top=pn_top - Y_THRESHOLD,
+                bottom=pn_top + Y_THRESHOLD
+            )
             if (
                 abs(w["top"] - pn_top) <= Y_THRESHOLD
                 and DESC_LEFT <= w["x0"] <= DESC_RIGHT
@@ -174,37 +183,13 @@ def extract_recommended_spares_table(normalized_table, debug=False):
 
         if debug:
             entry["trace"] = {
-                "pn_boxes": [{
-                    "text": pn_w["text"],
-                    "x0": pn_w["x0"],
-                    "x1": pn_w["x1"],
-                    "top": pn_w["top"],
-                    "bottom": pn_w["bottom"],
-                }],
-                "desc_boxes": [
-                    {
-                        "text": w["text"],
-                        "x0": w["x0"],
-                        "x1": w["x1"],
-                        "top": w["top"],
-                        "bottom": w["bottom"],
-                    }
-                    for w in desc_words
-                ]
+                "pn_boxes": [pn_w],
+                "desc_boxes": list(desc_words)
             }
 
             # 🔴 Title overlay support
             if section_title and title_words:
-                entry["trace"]["title_boxes"] = [
-                    {
-                        "text": w["text"],
-                        "x0": w["x0"],
-                        "x1": w["x1"],
-                        "top": w["top"],
-                        "bottom": w["bottom"],
-                    }
-                    for w in title_words
-                ]
+                entry["trace"]["title_boxes"] = list(title_words)
 
         results.append(entry)
 
@@ -150,16 +150,7 @@ def extract_split_header_item_part_table(normalized_table, debug=False):
                     "top": pn_words[0]["top"],
                     "bottom": pn_words[0]["bottom"],
                 }],
-                "desc_boxes": [
-                    {
-                        "text": w["text"],
-                        "x0": w["x0"],
-                        "x1": w["x1"],
-                        "top": w["top"],
-                        "bottom": w["bottom"],
-                    }
-                    for w in desc_words
-                ]
+                "desc_boxes": list(desc_words)
             }
 
         results.append(entry)
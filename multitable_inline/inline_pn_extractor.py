@@ -1,4 +1,8 @@
 import re
+from functools import partial
+
+from multitable_inline.provenance import Trace
+from multitable_inline.spatial_index import word_index
 
 PN_REGEX = re.compile(
     r"\(P\/N\s*([0-9A-Z\-\/]+)\)",
@@ -6,11 +10,39 @@ PN_REGEX = re.compile(
 )
 
 SENTENCE_SPLIT_REGEX = re.compile(r'[.!?]')
+SENTENCE_BOUNDARY_REGEX = re.compile(r'(?<=[.!?])\s+')
 
 MAX_DESC_CHARS = 300
 MAX_DESC_SENTENCES = 2
 
 
+def _pn_words(words, pn, trace):
+    # Words containing the PN (substring match)
+    return [w for w in words if pn in w["text"]]
+
+
+def _desc_words(table_candidate, trace):
+    # Words on the first PN word's line, left of it
+    pn_words = trace["pn_boxes"]
+
+    if not pn_words:
+        return []
+
+    pn_top = pn_words[0]["top"]
+    pn_x0 = pn_words[0]["x0"]
+
+    same_line = word_index(table_candidate).search(
+        right=pn_x0,
+        top=pn_top - 8,
+        bottom=pn_top + 8
+    )
+
+    return [
+        w for w in same_line
+        if abs(w["top"] - pn_top) < 8 and w["x1"] <= pn_x0
+    ]
+
+
 def extract_inline_pns(table_candidate, debug=False):
     page = table_candidate["page"]
     text = table_candidate.get("page_text", "")
@@ -78,7 +110,7 @@ def extract_inline_pns(table_candidate, debug=False):
         if len(desc) > MAX_DESC_CHARS:
             desc = desc[:MAX_DESC_CHARS].rsplit(" ", 1)[0]
 
-        sentences = re.split(r'(?<=[.!?])\s+', desc)
+        sentences = SENTENCE_BOUNDARY_REGEX.split(desc)
         if len(sentences) > MAX_DESC_SENTENCES:
             desc = " ".join(sentences[:MAX_DESC_SENTENCES])
 
@@ -86,54 +118,19 @@ def extract_inline_pns(table_candidate, debug=False):
             continue
 
         # ------------------------------
-        # Geometry capture
-        # ------------------------------
-
-        # ------------------------------
-        # Geometry capture (clean version)
+        # Geometry capture (deferred)
         # ------------------------------
-        
-        pn_boxes = []
-        desc_boxes = []
-        
-        # 1️⃣ Find PN words (substring match)
-        for w in words:
-            if pn in w["text"]:
-                pn_boxes.append({
-                    "text": w["text"],
-                    "x0": w["x0"],
-                    "x1": w["x1"],
-                    "top": w["top"],
-                    "bottom": w["bottom"],
-                })
-        
-        if pn_boxes:
-            pn_word = pn_boxes[0]
-            pn_top = pn_word["top"]
-            pn_x0 = pn_word["x0"]
-        
-            # 2️⃣ Capture words on same line, left of PN only
-            for w in words:
-                if (
-                    abs(w["top"] - pn_top) < 8 and
-                    w["x1"] <= pn_x0
-                ):
-                    desc_boxes.append({
-                        "text": w["text"],
-                        "x0": w["x0"],
-                        "x1": w["x1"],
-                        "top": w["top"],
-                        "bottom": w["bottom"],
-                    })
+        # Only computed when read: by the title anchor (first part's
+        # PN words) or, with debug, for the overlay
+        trace = Trace()
+        trace.defer("pn_boxes", partial(_pn_words, words, pn))
+        trace.defer("desc_boxes", partial(_desc_words, table_candidate))
 
         results.append({
             "page": page,
             "part_no": pn,
             "description": desc,
-            "trace": {
-                "pn_boxes": pn_boxes,
-                "desc_boxes": desc_boxes
-            }
+            "trace": trace
         })
 
         if debug:
@@ -0,0 +1,127 @@
+import json
+import time
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+
+
+# ==================================================
+# PIPELINE STATS
+# ==================================================
+class PipelineStats:
+    """
+    Wall time and call counts per stage, named counters, and one record
+    per processed page.
+
+    Stage names are dotted ("step2.is_parts_table", "extract.MARK");
+    nested stages are timed independently, so a parent's time includes
+    its children's.
+
+        stats = PipelineStats()
+        with stats.stage("normalize"):
+            ...
+        stats.count("words", len(words))
+        stats.report()   # JSON-serializable dict
+    """
+
+    enabled = True
+
+    def __init__(self):
+        self.stages = {}
+        self.counters = Counter()
+        self.pages = []
+
+    @contextmanager
+    def stage(self, name):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(name, time.perf_counter() - t0)
+
+    def add_time(self, name, seconds, calls=1):
+        entry = self.stages.get(name)
+
+        if entry is None:
+            entry = self.stages[name] = {"calls": 0, "seconds": 0.0}
+
+        entry["calls"] += calls
+        entry["seconds"] += seconds
+
+    def count(self, name, n=1):
+        self.counters[name] += n
+
+    def page(self, **record):
+        self.pages.append(record)
+
+    def merge(self, report):
+        """Add another report() (e.g. from a worker process) into this one."""
+
+        for name, entry in report["stages"].items():
+            self.add_time(name, entry["seconds"], entry["calls"])
+
+        self.counters.update(report["counters"])
+        self.pages.extend(report["pages"])
+
+    def report(self):
+        return {
+            "stages": {
+                name: {
+                    "calls": entry["calls"],
+                    "seconds": round(entry["seconds"], 6),
+                }
+                for name, entry in sorted(self.stages.items())
+            },
+            "counters": dict(sorted(self.counters.items())),
+            "pages": sorted(self.pages, key=lambda r: r.get("page", 0)),
+        }
+
+    def write_json(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.report(), f, indent=2)
+        return path
+
+
+class _NullStats:
+    """Stand-in used when instrumentation is off; every call is a no-op."""
+
+    enabled = False
+
+    _null = nullcontext()
+
+    def stage(self, name):
+        return self._null
+
+    def add_time(self, name, seconds, calls=1):
+        pass
+
+    def count(self, name, n=1):
+        pass
+
+    def page(self, **record):
+        pass
+
+
+NULL_STATS = _NullStats()
+
+
+def report_rows(report):
+    """Rows for a "Stats" worksheet: stages, then counters."""
+
+    rows = [["Stage", "Calls", "Seconds", "Avg ms"]]
+
+    for name, entry in report["stages"].items():
+        calls = entry["calls"]
+        rows.append([
+            name,
+            calls,
+            round(entry["seconds"], 4),
+            round(entry["seconds"] * 1000 / calls, 3) if calls else 0
+        ])
+
+    rows.append([])
+    rows.append(["Counter", "Value"])
+
+    for name, value in report["counters"].items():
+        rows.append([name, value])
+
+    return rows
@@ -0,0 +1,66 @@
+# ==================================================
+# PART TRACE (PROVENANCE FOR THE DEBUG OVERLAY)
+# ==================================================
+class Trace(dict):
+    """
+    Where one extracted part came from: role → page words
+    ("pn_boxes", "desc_boxes", "title_boxes") or a box ("drawing_box").
+
+    Roles hold references to the page's word dicts rather than copies.
+    A role can also be deferred with defer(role, compute); compute(trace)
+    then runs the first time something reads the role (e.g. the title
+    anchor reading "pn_boxes"), and never when nobody does.
+    """
+
+    def __init__(self, *args, **roles):
+        super().__init__(*args, **roles)
+        self._deferred = {}
+
+    def defer(self, role, compute):
+        self._deferred[role] = compute
+
+    def __missing__(self, role):
+        compute = self._deferred.pop(role, None)
+
+        if compute is None:
+            raise KeyError(role)
+
+        value = self[role] = compute(self)
+        return value
+
+    def __contains__(self, role):
+        return super().__contains__(role) or role in self._deferred
+
+    def __len__(self):
+        # Deferred roles count, so a trace holding only those is truthy
+        return super().__len__() + len(self._deferred)
+
+    def get(self, role, default=None):
+        return self[role] if role in self else default
+
+    def resolve(self):
+        """Computes every deferred role."""
+        for role in list(self._deferred):
+            self[role]
+        return self
+
+
+def finalize_traces(parts, debug=False):
+    """
+    Called once a page's parts are complete (titles assigned). With
+    debug, deferred roles are computed and each trace becomes a plain
+    dict (picklable, JSON-serializable) still pointing at the page's
+    words; without debug the traces are dropped, as only the overlay
+    reads them after the page.
+    """
+
+    for p in parts:
+        if "trace" not in p:
+            continue
+
+        if debug:
+            trace = p["trace"]
+            if isinstance(trace, Trace):
+                p["trace"] = dict(trace.resolve())
+        else:
+            del p["trace"]
@@ -0,0 +1,104 @@
+import sys
+
+import fitz  # PyMuPDF
+
+
+# Same word-splitting gap as pdfplumber's default x_tolerance
+X_TOLERANCE = 3
+
+
+def _line_words(line):
+    """
+    Splits one PyMuPDF text line into pdfplumber-style word dicts.
+
+    Like extract_words(extra_attrs=["size", "fontname"]), a word ends
+    at whitespace, at a gap wider than X_TOLERANCE, and wherever the
+    font or size changes (i.e. at span boundaries).
+    """
+
+    words = []
+
+    for span in line["spans"]:
+
+        size = span["size"]
+        fontname = sys.intern(span["font"])
+
+        # pdfminer boxes are one font size tall, ending at the descent
+        bottom = span["origin"][1] - span["descender"] * size
+        top = bottom - size
+
+        chars = []
+        last_x1 = None
+
+        def flush():
+            if chars:
+                words.append({
+                    "text": "".join(c["c"] for c in chars),
+                    "x0": chars[0]["bbox"][0],
+                    "x1": chars[-1]["bbox"][2],
+                    "top": top,
+                    "bottom": bottom,
+                    "size": size,
+                    "fontname": fontname,
+                })
+                chars.clear()
+
+        for c in span["chars"]:
+
+            if c["c"].isspace():
+                flush()
+                last_x1 = None
+                continue
+
+            if last_x1 is not None and c["bbox"][0] - last_x1 > X_TOLERANCE:
+                flush()
+
+            chars.append(c)
+            last_x1 = c["bbox"][2]
+
+        flush()
+
+    return words
+
+
+def extract_page_words(page):
+    """
+    Words of a fitz page in content-stream order, with the same keys
+    step 1 reads from pdfplumber (text, x0, x1, top, bottom, size,
+    fontname).
+    """
+
+    words = []
+    raw = page.get_text("rawdict", flags=fitz.TEXTFLAGS_RAWDICT & ~fitz.TEXT_PRESERVE_IMAGES)
+
+    for block in raw["blocks"]:
+        for line in block.get("lines", []):
+            words.extend(_line_words(line))
+
+    return words
+
+
+def read_pdf_pages(pdf_path, page_numbers=None):
+    """
+    PyMuPDF counterpart of step 1's pdfplumber reader: yields
+    (page_no, words) for every requested page, in order. words is
+    None when the page could not be read.
+    """
+
+    with fitz.open(pdf_path) as doc:
+
+        if page_numbers is None:
+            page_numbers = range(1, doc.page_count + 1)
+
+        for page_no in sorted(page_numbers):
+
+            if not 1 <= page_no <= doc.page_count:
+                continue
+
+            try:
+                words = extract_page_words(doc[page_no - 1])
+            except Exception as e:
+                print(f"[STEP1] Page {page_no} | Skipped due to PDF error: {e}")
+                words = None
+
+            yield page_no, words
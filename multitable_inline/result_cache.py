@@ -0,0 +1,132 @@
+import glob
+import hashlib
+import json
+import os
+import tempfile
+
+
+DEFAULT_CACHE_DIR = os.environ.get(
+    "PARTS_CACHE_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "parts_extractor")
+)
+
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+HASH_CHUNK = 1024 * 1024
+
+
+def file_sha256(path):
+    h = hashlib.sha256()
+
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK), b""):
+            h.update(chunk)
+
+    return h.hexdigest()
+
+
+def source_fingerprint(*extra_files):
+    """
+    Hash of the extraction code (this package + extra_files).
+    Any change to an extractor or heuristic invalidates cached results.
+    """
+    package_dir = os.path.dirname(os.path.abspath(__file__))
+    files = sorted(glob.glob(os.path.join(package_dir, "*.py"))) + list(extra_files)
+
+    h = hashlib.sha256()
+
+    for path in files:
+        h.update(os.path.basename(path).encode())
+        with open(path, "rb") as f:
+            h.update(f.read())
+
+    return h.hexdigest()[:16]
+
+
+# ==================================================
+# ON-DISK RESULT CACHE (LRU, SIZE-BOUNDED)
+# ==================================================
+class ResultCache:
+    """
+    Extracted part records keyed by PDF content hash, pipeline version
+    and page selection.
+
+    Entries are JSON files; reads refresh the file's mtime, and writes
+    evict the least recently used entries once the directory grows past
+    max_bytes.
+    """
+
+    def __init__(self, cache_dir=None, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir or DEFAULT_CACHE_DIR
+        self.max_bytes = max_bytes
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def key(self, pdf_path, version, pages=None, debug=False, pdf_hash=None, engine=None):
+        selection = ",".join(str(p) for p in sorted(pages)) if pages else "all"
+
+        h = hashlib.sha256()
+        h.update((pdf_hash or file_sha256(pdf_path)).encode())
+        h.update(version.encode())
+        h.update(selection.encode())
+        h.update((engine or "").encode())
+        # debug runs carry overlay traces
+        h.update(b"debug" if debug else b"")
+
+        return h.hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, key):
+        path = self._path(key)
+
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                record = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+        return record
+
+    def put(self, key, record):
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(record, f)
+            os.replace(tmp_path, self._path(key))
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        self._evict()
+
+    def _evict(self):
+        entries = []
+
+        for path in glob.glob(os.path.join(self.cache_dir, "*.json")):
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+
+        # Oldest access first
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
@@ -199,27 +199,9 @@ def extract_simple_3col_table(normalized_table, debug=False):
                     if debug:
                         entry["trace"] = {
 
-                            "pn_boxes": [
-                                {
-                                    "text": w["text"],
-                                    "x0": w["x0"],
-                                    "x1": w["x1"],
-                                    "top": w["top"],
-                                    "bottom": w["bottom"],
-                                }
-                                for w in pn_used_words
-                            ],
+                            "pn_boxes": list(pn_used_words),
                             
-                            "desc_boxes": [
-                                {
-                                    "text": w["text"],
-                                    "x0": w["x0"],
-                                    "x1": w["x1"],
-                                    "top": w["top"],
-                                    "bottom": w["bottom"],
-                                }
-                                for w in current_desc_words
-                            ]
+                            "desc_boxes": list(current_desc_words)
                         }
 
                     results.append(entry)
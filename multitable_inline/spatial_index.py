@@ -0,0 +1,162 @@
+import math
+from collections import defaultdict
+
+
+# Grid cell edge in PDF points (a couple of text lines tall)
+CELL_SIZE = 32
+
+# Key under which word_index() keeps a page's or table's index
+INDEX_KEY = "word_index"
+
+
+# ==================================================
+# UNIFORM GRID OVER WORD BOXES
+# ==================================================
+class WordIndex:
+    """
+    Uniform grid over word boxes for region and nearest-word queries.
+
+    Each word is registered in every cell its box overlaps, so a query
+    only looks at the cells under the query rectangle instead of every
+    word on the page. Results keep the order of the indexed word list,
+    so swapping a full scan for a query doesn't reorder anything.
+
+        index = WordIndex(words)
+        index.search(left=100, right=220, top=300, bottom=340)
+        index.nearest(150, 320)
+    """
+
+    def __init__(self, words, cell_size=CELL_SIZE):
+        self.words = words
+        self.cell_size = cell_size
+        self._cells = defaultdict(list)
+        self._extent = None
+
+        if not words:
+            return
+
+        cell = self._cell
+
+        for i, w in enumerate(words):
+            for cx in range(cell(w["x0"]), cell(w["x1"]) + 1):
+                for cy in range(cell(w["top"]), cell(w["bottom"]) + 1):
+                    self._cells[(cx, cy)].append(i)
+
+        cxs = [cx for cx, _ in self._cells]
+        cys = [cy for _, cy in self._cells]
+        self._extent = (min(cxs), max(cxs), min(cys), max(cys))
+
+    def __len__(self):
+        return len(self.words)
+
+    def _cell(self, v):
+        return math.floor(v / self.cell_size)
+
+    def _cell_range(self, lo, hi, extent_lo, extent_hi):
+        lo = extent_lo if lo is None else max(extent_lo, self._cell(lo))
+        hi = extent_hi if hi is None else min(extent_hi, self._cell(hi))
+        return range(lo, hi + 1)
+
+    def search(self, left=None, right=None, top=None, bottom=None):
+        """
+        Words whose box intersects the rectangle (None = unbounded
+        side), in index order. Callers apply their own exact test on
+        the result (e.g. x0 within a column), which is then the same
+        as scanning every word.
+        """
+
+        if self._extent is None:
+            return []
+
+        min_cx, max_cx, min_cy, max_cy = self._extent
+        cells = self._cells
+        hits = set()
+
+        for cx in self._cell_range(left, right, min_cx, max_cx):
+            for cy in self._cell_range(top, bottom, min_cy, max_cy):
+                found = cells.get((cx, cy))
+                if found:
+                    hits.update(found)
+
+        words = self.words
+
+        return [
+            w for w in (words[i] for i in sorted(hits))
+            if (
+                (left is None or w["x1"] >= left)
+                and (right is None or w["x0"] <= right)
+                and (top is None or w["bottom"] >= top)
+                and (bottom is None or w["top"] <= bottom)
+            )
+        ]
+
+    def nearest(self, x, y, max_distance=math.inf, predicate=None):
+        """
+        Word whose box is closest to the point (x, y) among those
+        accepted by predicate, or None. Ties go to the earlier word.
+        """
+
+        if self._extent is None:
+            return None
+
+        min_cx, max_cx, min_cy, max_cy = self._extent
+        px, py = self._cell(x), self._cell(y)
+
+        best = None
+        best_key = (max_distance, 0)
+        seen = set()
+
+        # Rings of cells around the point's cell, nearest first
+        max_ring = max(abs(px - min_cx), abs(px - max_cx), abs(py - min_cy), abs(py - max_cy))
+
+        for ring in range(max_ring + 1):
+
+            # Words outside this ring are at least ring * cell_size away
+            if best is not None and best_key[0] <= (ring - 1) * self.cell_size:
+                break
+            if (ring - 1) * self.cell_size > max_distance:
+                break
+
+            for cx in range(px - ring, px + ring + 1):
+                for cy in range(py - ring, py + ring + 1):
+
+                    if max(abs(cx - px), abs(cy - py)) != ring:
+                        continue
+
+                    for i in self._cells.get((cx, cy), ()):
+                        if i in seen:
+                            continue
+                        seen.add(i)
+
+                        w = self.words[i]
+                        if predicate is not None and not predicate(w):
+                            continue
+
+                        dx = max(w["x0"] - x, 0, x - w["x1"])
+                        dy = max(w["top"] - y, 0, y - w["bottom"])
+                        key = (math.hypot(dx, dy), i)
+
+                        if key[0] <= max_distance and (best is None or key < best_key):
+                            best, best_key = w, key
+
+        return best
+
+
+def word_index(table):
+    """
+    The WordIndex shared by everything that queries one page candidate
+    or normalized table, built on first use (over "words", or the words
+    of "rows" in row order).
+    """
+
+    index = table.get(INDEX_KEY)
+
+    if index is None:
+        if "words" in table:
+            words = table["words"] or []
+        else:
+            words = [w for row in table.get("rows", []) for w in row["words"]]
+
+        index = table[INDEX_KEY] = WordIndex(words)
+
+    return index
@@ -1,32 +1,343 @@
+import sys
+
 import pdfplumber
 
-def extract_table_candidates(pdf_path):
+from multitable_inline import pymupdf_words
+
+
+# Matches pdfplumber's default line clustering in extract_text()
+LINE_TOLERANCE = 3
+
+# pdfplumber's default x_tolerance: closer characters form one word
+X_TOLERANCE = 3
 
+# The word keys later steps read; pdfplumber's others (doctop, upright,
+# height, width, direction) are dropped right after extraction
+WORD_KEYS = ("text", "x0", "x1", "top", "bottom", "size", "fontname")
+
+
+def pages_to_extract(pages):
     """
-    Returns ALL possible table-like regions.
-    No filtering. No assumptions.
+    Page numbers step 1 must read to serve a page selection:
+    page 1 (vendor/model detection), every selected page, and the
+    page before each selected page (previous-page title fallback; when
+    that page is blank, nearest_page_before reads further back).
+
+    Returns None when every page is needed.
     """
-    candidates = []
+    if not pages:
+        return None
+
+    needed = {1}
+
+    for p in pages:
+        needed.add(p)
+        if p > 1:
+            needed.add(p - 1)
+
+    return needed
 
+
+def count_pages(pdf_path):
     with pdfplumber.open(pdf_path) as pdf:
-        for page_no, page in enumerate(pdf.pages, start=1):
+        return len(pdf.pages)
+
+
+def words_to_text(words):
+    """
+    Rebuilds the page text from extracted words, like extract_text():
+    words are clustered into lines by their top edge and read left to
+    right, one line per text line.
+
+    Step 1 also splits words where the content stream draws text out
+    of reading order or changes font, which extract_text() does not
+    (it builds words from x-sorted characters). Neighbours on a line
+    within X_TOLERANCE are therefore joined without a space, unless
+    they follow each other in the stream in the same font: then only
+    a blank can have split them.
+    """
+
+    if not words:
+        return ""
+
+    lines = []
+    line = []
+    last_top = None
+
+    # Indices into words (stream order) so stream neighbours can be told apart
+    for i in sorted(range(len(words)), key=lambda i: words[i]["top"]):
+        top = words[i]["top"]
+
+        if last_top is not None and top > last_top + LINE_TOLERANCE:
+            lines.append(line)
+            line = []
+
+        line.append(i)
+        last_top = top
+
+    lines.append(line)
+
+    text_lines = []
+
+    for line in lines:
+        parts = []
+        prev_i = None
+
+        for i in sorted(line, key=lambda i: words[i]["x0"]):
+            w = words[i]
+
+            if prev_i is not None:
+                prev = words[prev_i]
+
+                split_by_blank = (
+                    i == prev_i + 1
+                    and w.get("fontname") == prev.get("fontname")
+                    and w.get("size") == prev.get("size")
+                )
+
+                if split_by_blank or w["x0"] - prev["x1"] > X_TOLERANCE:
+                    parts.append(" ")
+
+            parts.append(w["text"])
+            prev_i = i
+
+        text_lines.append("".join(parts))
+
+    return "\n".join(text_lines)
+
+
+def compact_words(words):
+    """
+    Trims word dicts to WORD_KEYS, with one shared string per font
+    name, so a page's words take about half the memory.
+    """
+
+    compact = []
+
+    for w in words:
+        word = {key: w[key] for key in WORD_KEYS if key in w}
+
+        if "fontname" in word:
+            word["fontname"] = sys.intern(word["fontname"])
+
+        compact.append(word)
+
+    return compact
+
+
+class PageCandidate(dict):
+    """
+    Page candidate dict whose "page_text" is derived from "words" on
+    first access and then kept.
+    """
+
+    def __missing__(self, key):
+        if key != "page_text":
+            raise KeyError(key)
+
+        text = self["page_text"] = words_to_text(self.get("words"))
+        return text
+
+    def get(self, key, default=None):
+        if key == "page_text":
+            return self["page_text"]
+        return super().get(key, default)
+
+
+def _read_pdf_pages(pdf_path, page_numbers=None):
+    """
+    Yields (page_no, words) for every requested page, in order,
+    releasing pdfplumber's per-page cache after each one.
+    words is None when the page could not be read.
+    """
+
+    open_pages = sorted(page_numbers) if page_numbers is not None else None
+
+    with pdfplumber.open(pdf_path, pages=open_pages) as pdf:
+        for page in pdf.pages:
+            page_no = page.page_number
+
             try:
-                words = page.extract_words(
+                words = compact_words(page.extract_words(
                     use_text_flow=True,
                     keep_blank_chars=False,
                     extra_attrs=["size", "fontname"]
-                )
+                ))
             except Exception as e:
                 print(f"[STEP1] Page {page_no} | Skipped due to PDF error: {e}")
-                continue
+                words = None
 
-            if not words:
-                continue
+            page.close()
 
-            candidates.append({
-                "page": page_no,
-                "words": words,
-                "page_text": page.extract_text() or ""
-            })
+            yield page_no, words
 
-    return candidates
+
+# Step 1 word-extraction backends: engine name → page reader
+ENGINES = {
+    "pdfplumber": _read_pdf_pages,
+    "pymupdf": pymupdf_words.read_pdf_pages,
+}
+
+DEFAULT_ENGINE = "pdfplumber"
+
+
+def get_engine(engine=None):
+    engine = engine or DEFAULT_ENGINE
+
+    if engine not in ENGINES:
+        raise ValueError(
+            f"Unknown extraction engine {engine!r} (expected one of: {', '.join(ENGINES)})"
+        )
+
+    return ENGINES[engine]
+
+
+def _iter_cached_pages(pdf_path, page_numbers, word_cache, pdf_hash=None, engine=None):
+    """
+    Pages from the word cache; only pages not cached yet are parsed
+    (and then stored).
+    """
+
+    read_pages = get_engine(engine)
+    doc = word_cache.document(pdf_path, pdf_hash=pdf_hash, engine=engine)
+
+    page_count = doc.get_meta("page_count")
+
+    if page_count is None:
+        page_count = count_pages(pdf_path)
+        doc.set_meta("page_count", page_count)
+
+    if page_numbers is None:
+        page_numbers = range(1, page_count + 1)
+
+    page_numbers = sorted(n for n in page_numbers if 1 <= n <= page_count)
+
+    missing = [n for n in page_numbers if not doc.has_page(n)]
+    fresh = read_pages(pdf_path, missing) if missing else iter(())
+    missing = set(missing)
+
+    for page_no in page_numbers:
+
+        if page_no in missing:
+            _, words = next(fresh)
+
+            # Unreadable pages are not cached (a later run retries them)
+            if words is not None:
+                doc.store_page(page_no, words)
+
+        else:
+            words = doc.load_page(page_no)
+
+        yield page_no, words
+
+
+def iter_page_candidates(
+    pdf_path,
+    page_numbers=None,
+    word_cache=None,
+    pdf_hash=None,
+    engine=None,
+    on_skip=None
+):
+
+    """
+    Yields one page candidate at a time for the given page numbers
+    (all pages if None). Only the page currently being processed is
+    held in memory.
+
+    engine picks the word-extraction backend (see ENGINES); both emit
+    the same word dicts.
+
+    With a word_cache (WordCache), cached pages are loaded from disk
+    instead of parsing the PDF.
+
+    "page_text" is built from the words only when a consumer reads it.
+
+    Pages without words (blank or unreadable) are not yielded;
+    on_skip(page_no) is called for each of them instead.
+    """
+
+    if word_cache is not None:
+        pages_iter = _iter_cached_pages(pdf_path, page_numbers, word_cache, pdf_hash, engine)
+    else:
+        pages_iter = get_engine(engine)(pdf_path, page_numbers)
+
+    for page_no, words in pages_iter:
+
+        if not words:
+            if on_skip is not None:
+                on_skip(page_no)
+            continue
+
+        yield PageCandidate(
+            page=page_no,
+            words=words
+        )
+
+
+def nearest_page_before(
+    pdf_path,
+    page_no,
+    word_cache=None,
+    pdf_hash=None,
+    engine=None,
+    chunk=4
+):
+    """
+    The closest page candidate before page_no that has words (None if
+    there is none), i.e. the page a full run would treat as previous.
+    Pages are read backwards, chunk pages at a time.
+    """
+
+    end = page_no
+
+    while end > 1:
+        start = max(1, end - chunk)
+        found = None
+
+        for page_data in iter_page_candidates(
+            pdf_path,
+            page_numbers=range(start, end),
+            word_cache=word_cache,
+            pdf_hash=pdf_hash,
+            engine=engine
+        ):
+            found = page_data
+
+        if found is not None:
+            return found
+
+        end = start
+
+    return None
+
+
+def iter_table_candidates(pdf_path, pages=None, word_cache=None, engine=None):
+
+    """
+    Streaming variant of extract_table_candidates.
+
+    Only the page currently being processed is held in memory. If pages
+    is given, only the pages returned by pages_to_extract are parsed.
+    """
+
+    return iter_page_candidates(
+        pdf_path,
+        page_numbers=pages_to_extract(pages),
+        word_cache=word_cache,
+        engine=engine
+    )
+
+
+def extract_table_candidates(pdf_path, pages=None, word_cache=None, engine=None):
+
+    """
+    Returns ALL possible table-like regions.
+    No filtering. No assumptions.
+    """
+    return list(iter_table_candidates(
+        pdf_path,
+        pages=pages,
+        word_cache=word_cache,
+        engine=engine
+    ))
@@ -11,6 +11,14 @@ FOOTER_Y_RATIO = 0.90
 MAX_FOOTER_WORDS = 25
 MIN_PN_COLUMN_HITS = 2
 
+BOM_HEADER_KEYS = (
+    "item",
+    "qty",
+    "part",
+    "part number",
+    "description",
+)
+
 
 # ==================================================
 # BASIC STRUCTURAL HEURISTIC
@@ -33,14 +41,6 @@ def looks_like_table(words):
 # BOM REGION DETECTOR
 # ==================================================
 def detect_bom_region(words):
-    HEADER_KEYS = {
-        "item",
-        "qty",
-        "part",
-        "part number",
-        "description",
-    }
-
     lines = {}
     for w in words:
         y = round(w["top"] / 5) * 5
@@ -48,7 +48,7 @@ def detect_bom_region(words):
 
     for y, ws in lines.items():
         text_line = " ".join(w["text"].lower() for w in ws)
-        hits = sum(1 for k in HEADER_KEYS if k in text_line)
+        hits = sum(1 for k in BOM_HEADER_KEYS if k in text_line)
 
         if hits >= 2:
             return {
@@ -64,7 +64,11 @@ def detect_bom_region(words):
 # ==================================================
 # MAIN TABLE DECISION LOGIC
 # ==================================================
-def is_parts_table(table_candidate, debug=False):
+def is_parts_table(table_candidate, debug=False, geometry=None):
+    """
+    geometry: optional PageGeometry for this page; the body-only
+    normalization is then memoized there instead of recomputed.
+    """
 
     page = table_candidate["page"]
     words = table_candidate.get("words", [])
@@ -112,13 +116,18 @@ def is_parts_table(table_candidate, debug=False):
     # --------------------------------------------------
     # NORMALIZE ONCE (used by all branches)
     # --------------------------------------------------
-    normalized = normalize_table(
-        {
-            "page": page,
-            "words": body_words
-        },
-        debug=False
-    )
+    if geometry is not None:
+        # No footer removed → the body variant is the full page
+        variant = "page" if len(body_words) == len(words) else "body"
+        normalized = geometry.normalized(variant, body_words)
+    else:
+        normalized = normalize_table(
+            {
+                "page": page,
+                "words": body_words
+            },
+            debug=False
+        )
 
     rows = normalized.get("rows", [])
     columns = normalized.get("columns", [])
@@ -1,14 +1,81 @@
+from functools import lru_cache
+
+import numpy as np
+
+from multitable_inline.instrumentation import NULL_STATS
 from multitable_inline.patterns import PART_NO_REGEX, X_TOL, Y_TOL
 
 
+STRUCTURAL_TOKENS = {"REF", "NS"}
+
+# Structural columns kept per table (left to right)
+MAX_COLUMNS = 4
+
+
 def is_structural_word(w):
     t = w["text"]
     return (
         t.isdigit() or
-        t.upper() in {"REF", "NS"} or
+        t.upper() in STRUCTURAL_TOKENS or
         PART_NO_REGEX.search(t)
     )
 
+
+@lru_cache(maxsize=65536)
+def _text_flags(t):
+    """(structural, PART_NO_REGEX hit) for a word text."""
+    pn = PART_NO_REGEX.search(t) is not None
+    return (pn or t.isdigit() or t.upper() in STRUCTURAL_TOKENS), pn
+
+
+def _word_arrays(words):
+    """
+    x0 positions, structural mask and PART_NO_REGEX hits as arrays.
+    Text classification is cached, so the regex runs once per distinct
+    text (the "page" and "body" variants share the same words).
+    """
+    n = len(words)
+
+    x0 = np.fromiter((w["x0"] for w in words), dtype=np.float64, count=n)
+    flags = np.array([_text_flags(w["text"]) for w in words], dtype=bool).reshape(n, 2)
+
+    return x0, flags[:, 0], flags[:, 1]
+
+
+def _cluster_columns(xs, tol=X_TOL * 2, limit=MAX_COLUMNS):
+    """
+    Column centres of sorted x positions. An x joins the current column
+    while within tol of its running average ((c + x) / 2), otherwise it
+    starts the next one.
+
+    With sorted input only the last column can still take an x, so a
+    gap of tol or more always splits: the array is cut at those gaps
+    and the running average is only replayed inside each run. Stops
+    once `limit` columns are final.
+    """
+    if not len(xs):
+        return []
+
+    columns = []
+
+    for run in np.split(xs, np.flatnonzero(np.diff(xs) >= tol) + 1):
+        run = run.tolist()
+        c = run[0]
+
+        for x in run[1:]:
+            if abs(c - x) < tol:
+                c = (c + x) / 2
+            else:
+                columns.append(c)
+                c = x
+
+        columns.append(c)
+
+        if len(columns) > limit:
+            break
+
+    return columns[:limit]
+
 def _looks_like_header_row(row):
 
     HEADER_KEYWORDS = {
@@ -61,24 +128,57 @@ def _merge_fragmented_words(row_words, gap_threshold=6):
         return row_words
 
     merged = []
-    current = row_words[0].copy()
+    current = row_words[0]
+
+    # Words are only copied when something is merged into them;
+    # untouched words are shared with the page
+    copied = False
 
     for w in row_words[1:]:
         gap = w["x0"] - current["x1"]
 
         # If small horizontal gap → merge
         if gap >= 0 and gap <= gap_threshold:
+            if not copied:
+                current = current.copy()
+                copied = True
+
             current["text"] += w["text"]
             current["x1"] = w["x1"]
             current["bottom"] = max(current["bottom"], w["bottom"])
         else:
             merged.append(current)
-            current = w.copy()
+            current = w
+            copied = False
 
     merged.append(current)
     return merged
 
 
+def _group_rows(words):
+    """
+    Group words into rows by vertical position (single sweep).
+
+    Words are visited in top order. A row's top is the top of its first
+    word, and new rows start at least Y_TOL below the previous row, so
+    the only row a word can join is the most recent one. This gives the
+    same rows as checking every existing row, in O(n log n).
+    """
+    rows = []
+
+    for w in sorted(words, key=lambda x: x["top"]):
+
+        if rows and abs(rows[-1]["top"] - w["top"]) < Y_TOL:
+            rows[-1]["words"].append(w)
+        else:
+            rows.append({
+                "top": w["top"],
+                "words": [w]
+            })
+
+    return rows
+
+
 # -------------------------------------------------
 # NEW: Detect table title using font dominance
 # -------------------------------------------------
@@ -144,56 +244,27 @@ def normalize_table(table_candidate, debug=False):
     # -------------------------------------------------
     # 1. CLUSTER STRUCTURAL COLUMNS
     # -------------------------------------------------
-    struct_words = [w for w in words if is_structural_word(w)]
-    xs = sorted(w["x0"] for w in struct_words)
-
-    columns = []
-
-    for x in xs:
-        for i, cx in enumerate(columns):
-            if abs(cx - x) < (X_TOL * 2):
-                columns[i] = (cx + x) / 2
-                break
-        else:
-            columns.append(x)
+    x0, structural, pn = _word_arrays(words)
 
-    columns = sorted(columns)
-    columns = columns[:4]  # hard limit
+    struct_x = x0[structural]
+    columns = _cluster_columns(np.sort(struct_x))  # hard limit: MAX_COLUMNS
 
     # -------------------------------------------------
     # 2. DETECT PART NUMBER COLUMN (existing logic)
     # -------------------------------------------------
-    col_part_hits = {i: 0 for i in range(len(columns))}
-
-    for w in struct_words:
-        for i, cx in enumerate(columns):
-            if abs(w["x0"] - cx) < (X_TOL * 2):
-                if PART_NO_REGEX.search(w["text"]):
-                    col_part_hits[i] += 1
+    # Structural PN words within reach of each column
+    # (a word near two columns counts for both)
+    part_col = None
 
-    part_col = max(col_part_hits, key=col_part_hits.get) if col_part_hits else None
+    if columns:
+        near = np.abs(struct_x[:, None] - np.array(columns)[None, :]) < (X_TOL * 2)
+        col_part_hits = (near & pn[structural][:, None]).sum(axis=0)
+        part_col = int(np.argmax(col_part_hits))
 
     # -------------------------------------------------
     # 3. GROUP WORDS INTO ROWS
     # -------------------------------------------------
-    rows = []
-
-    # First sort by vertical position
-    for w in sorted(words, key=lambda x: x["top"]):
-
-        placed = False
-
-        for row in rows:
-            if abs(row["top"] - w["top"]) < Y_TOL:
-                row["words"].append(w)
-                placed = True
-                break
-
-        if not placed:
-            rows.append({
-                "top": w["top"],
-                "words": [w]
-            })
+    rows = _group_rows(words)
 
     # -------------------------------------------------
     # ⭐ CRITICAL FIX — ENFORCE LEFT → RIGHT ORDER
@@ -299,30 +370,93 @@ def normalize_table(table_candidate, debug=False):
     table_top_y = min(w["top"] for r in rows for w in r["words"])
     table_title = detect_table_title(words, table_top_y)
 
+    normalized = {
+        "page": page,
+        "columns": columns,
+        "rows": rows,
+        "part_col": part_col,
+        "table_title": table_title,
+    }
+
     # -------------------------------------------------
     # 5. DEBUG
     # -------------------------------------------------
     if debug:
-        print(
-            f"[STEP3] Page {page} | "
-            f"Columns={len(columns)} | "
-            f"Rows={len(rows)} | "
-            f"PartCol={part_col}"
-        )
-
-        if table_title:
-            print(f"[STEP3] Page {page} | Title: {table_title}")
-
-        for i, r in enumerate(rows[:15]):
-            print(f"   Row {i+1}: {[w['text'] for w in r['words']]}")
+        _print_normalized(normalized)
 
     # -------------------------------------------------
     # 6. RETURN
     # -------------------------------------------------
-    return {
-        "page": page,
-        "columns": columns,
-        "rows": rows,
-        "part_col": part_col,
-        "table_title": table_title,
-    }
+    return normalized
+
+
+def _print_normalized(normalized):
+
+    page = normalized["page"]
+    rows = normalized["rows"]
+
+    print(
+        f"[STEP3] Page {page} | "
+        f"Columns={len(normalized['columns'])} | "
+        f"Rows={len(rows)} | "
+        f"PartCol={normalized['part_col']}"
+    )
+
+    if normalized["table_title"]:
+        print(f"[STEP3] Page {page} | Title: {normalized['table_title']}")
+
+    for i, r in enumerate(rows[:15]):
+        print(f"   Row {i+1}: {[w['text'] for w in r['words']]}")
+
+
+# -------------------------------------------------
+# PER-PAGE MEMOIZED GEOMETRY
+# -------------------------------------------------
+class PageGeometry:
+    """
+    Lazily computed normalize_table results for one page, shared by
+    every classifier probe and extractor in the dispatch.
+
+    Each variant ("page" = all words, "body" = words above the footer)
+    is normalized at most once. Callers must treat the returned tables
+    as read-only.
+
+    stats (PipelineStats) times each normalize_table call.
+    """
+
+    def __init__(self, page_data, stats=NULL_STATS):
+        self.page_data = page_data
+        self.stats = stats
+        self._cache = {}
+        self._printed = set()
+
+    def row_count(self, variant="page"):
+        """Rows of a variant if it was normalized, else None."""
+        normalized = self._cache.get(variant)
+        return len(normalized["rows"]) if normalized else None
+
+    def normalized(self, variant="page", words=None, debug=False):
+
+        if variant not in self._cache:
+            if words is None:
+                words = self.page_data.get("words", [])
+
+            with self.stats.stage("normalize"):
+                self._cache[variant] = normalize_table(
+                    {
+                        "page": self.page_data["page"],
+                        "words": words
+                    },
+                    debug=False
+                )
+
+            self.stats.count("rows", len(self._cache[variant]["rows"]))
+
+        normalized = self._cache[variant]
+
+        # Debug output once per variant, on the first debug request
+        if debug and variant not in self._printed and normalized["rows"]:
+            self._printed.add(variant)
+            _print_normalized(normalized)
+
+        return normalized
@@ -1,5 +1,9 @@
 import csv
+import json
 import os
+from collections import Counter, defaultdict
+
+from openpyxl import Workbook
 
 
 def export_parts(parts, output_csv):
@@ -23,3 +27,364 @@ def export_parts(parts, output_csv):
             ])
 
     return output_csv
+
+
+# ==================================================
+# STREAMING XLSX EXPORT (PARTS + SUMMARY)
+# ==================================================
+PARTS_HEADER = [
+    "Vendor",
+    "Model",
+    "DESCRIPTION",
+    "Title_EQUIPMENT_PROJECT",
+    "Drawing",
+    "No Item-(Mnl)",
+    "pageno_FILENAME",
+    "project",
+    "Sub Project No-(Mnl)",
+    "Equipment Name-(Mnl)"
+]
+
+
+class PartsWriter:
+    """
+    Base for the streaming part-record writers.
+
+    Rows carry the Parts sheet columns (PARTS_HEADER). Subclasses
+    implement write_row() and close(), and release() when they hold
+    open files.
+
+        writer = CsvPartsWriter(output_path, vendor=..., ...)
+        for parts in ...:
+            writer.write(parts)
+        writer.close(pages_scanned)
+
+    A combined writer (combined=True) takes several documents: call
+    start_document() before each one's parts. Rows then end with a
+    "filename" column.
+    """
+
+    extension = None
+
+    def __init__(
+        self,
+        output_path,
+        vendor=None,
+        model=None,
+        project=None,
+        subproject=None,
+        equipment=None,
+        pdf_path=None,
+        combined=False
+    ):
+        self.output_path = output_path
+        self.combined = combined
+        self.header = PARTS_HEADER + ["filename"] if combined else PARTS_HEADER
+
+        self.vendor = vendor or "N/A"
+        self.model = model or "N/A"
+        self.project = project or "N/A"
+        self.subproject = subproject or "N/A"
+        self.equipment = equipment or "N/A"
+        self.filename = os.path.basename(pdf_path) if pdf_path else "N/A"
+
+        self.total_parts = 0
+
+        out_dir = os.path.dirname(output_path)
+        if out_dir:
+            os.makedirs(out_dir, exist_ok=True)
+
+    def start_document(self, pdf_path, vendor=None, model=None, filename=None):
+        self.filename = filename or os.path.basename(pdf_path)
+        self.vendor = vendor or "N/A"
+        self.model = model or "N/A"
+
+    def row(self, p):
+        row = [
+            self.vendor,
+            self.model,
+            p["description"],
+            p.get("title", ""),
+            p.get("drawing_number", ""),
+            p["part_no"],
+            f'{p["page"]}_{self.filename}',
+            self.project,
+            self.subproject,
+            self.equipment
+        ]
+
+        if self.combined:
+            row.append(self.filename)
+
+        return row
+
+    def write(self, parts):
+        for p in parts:
+            self.write_row(self.row(p), p)
+            self.total_parts += 1
+
+    def write_row(self, row, part):
+        raise NotImplementedError
+
+    def close(self, pages_scanned):
+        raise NotImplementedError
+
+    def release(self):
+        pass
+
+    def abort(self):
+        """Stop without finishing the output; the partial file is removed."""
+
+        self.release()
+
+        if os.path.exists(self.output_path):
+            os.remove(self.output_path)
+
+
+class XlsxPartsWriter(PartsWriter):
+    """
+    Parts workbook written row by row.
+
+    Uses openpyxl write-only worksheets, so rows go straight to disk
+    instead of being kept as cell objects. The Summary aggregates
+    (parts per page, duplicate part numbers) are accumulated as parts
+    are written; the Summary sheet is emitted on close().
+    """
+
+    extension = ".xlsx"
+
+    def __init__(self, output_path, **kwargs):
+        super().__init__(output_path, **kwargs)
+
+        self.wb = Workbook(write_only=True)
+        self.ws_parts = self.wb.create_sheet("Parts")
+        self.ws_parts.append(self.header)
+
+        # Summary aggregates
+        self.parts_per_page = defaultdict(int)
+        self.pn_counts = Counter()
+        self.pn_pages = defaultdict(set)
+
+        # (title, rows) written after Summary
+        self.extra_sheets = []
+
+    def add_sheet(self, title, rows):
+        self.extra_sheets.append((title, rows))
+
+    def write_row(self, row, p):
+        self.ws_parts.append(row)
+
+        # Combined workbooks count pages per document
+        page = (self.filename, p["page"]) if self.combined else p["page"]
+
+        self.parts_per_page[page] += 1
+        self.pn_counts[p["part_no"]] += 1
+        self.pn_pages[p["part_no"]].add(page)
+
+    def close(self, pages_scanned):
+        ws_summary = self.wb.create_sheet("Summary")
+
+        duplicate_pns = {
+            pn: {
+                "count": cnt,
+                "pages": sorted(self.pn_pages[pn])
+            }
+            for pn, cnt in self.pn_counts.items()
+            if cnt > 1
+        }
+
+        ws_summary.append(["Metric", "Value"])
+        ws_summary.append(["Pages scanned", pages_scanned])
+        ws_summary.append(["Total parts extracted", self.total_parts])
+        ws_summary.append(["Pages with parts", len(self.parts_per_page)])
+        ws_summary.append(["Pages without parts", pages_scanned - len(self.parts_per_page)])
+        ws_summary.append(["Duplicate part numbers", len(duplicate_pns)])
+
+        ws_summary.append([])
+        ws_summary.append(["Parts per page"])
+        if self.combined:
+            ws_summary.append(["File", "Page", "Count"])
+
+            for (filename, page), count in sorted(self.parts_per_page.items()):
+                ws_summary.append([filename, page, count])
+        else:
+            ws_summary.append(["Page", "Count"])
+
+            for page in sorted(self.parts_per_page):
+                ws_summary.append([page, self.parts_per_page[page]])
+
+        ws_summary.append([])
+        ws_summary.append(["Duplicate Part Numbers"])
+        ws_summary.append(["Part No", "Occurrences", "Pages"])
+
+        for pn, info in duplicate_pns.items():
+            if self.combined:
+                pages = ", ".join(f"{f}:{page}" for f, page in info["pages"])
+            else:
+                pages = ", ".join(map(str, info["pages"]))
+
+            ws_summary.append([
+                pn,
+                info["count"],
+                pages
+            ])
+
+        for title, rows in self.extra_sheets:
+            ws = self.wb.create_sheet(title)
+            for row in rows:
+                ws.append(row)
+
+        self.wb.save(self.output_path)
+        return self.output_path
+
+    def release(self):
+        # Write-only sheets stream rows into temp files through an open
+        # generator; close them here rather than at garbage collection
+        # (when the stream is already gone) and drop the temp files
+        for ws in self.wb.worksheets:
+            if ws.closed:
+                continue
+
+            ws.close()
+
+            if ws._writer is not None and os.path.exists(ws._writer.out):
+                ws._writer.cleanup()
+
+
+class CsvPartsWriter(PartsWriter):
+    """Parts sheet columns as UTF-8 CSV, one row per part."""
+
+    extension = ".csv"
+
+    def __init__(self, output_path, **kwargs):
+        super().__init__(output_path, **kwargs)
+
+        self.f = open(output_path, "w", newline="", encoding="utf-8")
+        self.writer = csv.writer(self.f)
+        self.writer.writerow(self.header)
+
+    def write_row(self, row, p):
+        self.writer.writerow(row)
+
+    def close(self, pages_scanned):
+        self.f.close()
+        return self.output_path
+
+    def release(self):
+        self.f.close()
+
+
+class NdjsonPartsWriter(PartsWriter):
+    """One JSON object per part and line, keyed by the column headers."""
+
+    extension = ".ndjson"
+
+    def __init__(self, output_path, **kwargs):
+        super().__init__(output_path, **kwargs)
+
+        self.f = open(output_path, "w", encoding="utf-8")
+
+    def write_row(self, row, p):
+        self.f.write(json.dumps(dict(zip(self.header, row)), ensure_ascii=False))
+        self.f.write("\n")
+
+    def close(self, pages_scanned):
+        self.f.close()
+        return self.output_path
+
+    def release(self):
+        self.f.close()
+
+
+class ParquetPartsWriter(PartsWriter):
+    """
+    Parts sheet columns as Parquet (string columns). Rows are buffered
+    and flushed as one row group every batch_size parts.
+
+    Needs pyarrow.
+    """
+
+    extension = ".parquet"
+
+    def __init__(self, output_path, batch_size=50000, **kwargs):
+        super().__init__(output_path, **kwargs)
+
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        self.pa = pa
+        self.schema = pa.schema([(name, pa.string()) for name in self.header])
+        self.writer = pq.ParquetWriter(output_path, self.schema)
+        self.batch_size = batch_size
+        self.columns = [[] for _ in self.header]
+
+    def write_row(self, row, p):
+        for column, value in zip(self.columns, row):
+            column.append(None if value is None else str(value))
+
+        if len(self.columns[0]) >= self.batch_size:
+            self._flush()
+
+    def _flush(self):
+        if self.columns[0]:
+            self.writer.write_table(
+                self.pa.Table.from_arrays(self.columns, schema=self.schema)
+            )
+            self.columns = [[] for _ in self.header]
+
+    def close(self, pages_scanned):
+        self._flush()
+        self.writer.close()
+        return self.output_path
+
+    def release(self):
+        self.writer.close()
+
+
+# Output format → writer
+WRITERS = {
+    "xlsx": XlsxPartsWriter,
+    "csv": CsvPartsWriter,
+    "parquet": ParquetPartsWriter,
+    "ndjson": NdjsonPartsWriter,
+}
+
+
+def resolve_formats(formats):
+    """Validated, de-duplicated tuple of output formats."""
+
+    if isinstance(formats, str):
+        formats = (formats,)
+
+    unknown = [f for f in formats if f not in WRITERS]
+    if unknown:
+        raise ValueError(
+            f"Unknown output format(s) {', '.join(unknown)} (expected: {', '.join(WRITERS)})"
+        )
+
+    if not formats:
+        raise ValueError("At least one output format is required")
+
+    return tuple(dict.fromkeys(formats))
+
+
+def open_writers(base_path, formats=("xlsx",), **kwargs):
+    """
+    One writer per requested format, writing to base_path with the
+    format's extension (base_path is taken without its extension).
+    """
+
+    base, _ = os.path.splitext(base_path)
+    writers = []
+
+    try:
+        for fmt in resolve_formats(formats):
+            writers.append(WRITERS[fmt](base + WRITERS[fmt].extension, **kwargs))
+
+    except BaseException:
+        # e.g. pyarrow missing for parquet: drop the files already opened
+        for writer in writers:
+            writer.abort()
+        raise
+
+    return writers
@@ -0,0 +1,301 @@
+import re
+
+from multitable_inline.extract_mark_table import extract_mark_table
+from multitable_inline.extract_pmh_mos_table import extract_pmh_mos_table
+from multitable_inline.extract_balloon_bom_table import extract_balloon_bom_table
+from multitable_inline.extract_recommended_spares_table import extract_recommended_spares_table
+from multitable_inline.extract_split_header_item_part_table import extract_split_header_item_part_table
+from multitable_inline.extract_single_level_bom import extract_single_level_bom
+from multitable_inline.extract_article_number_table import extract_article_number_table
+from multitable_inline.extract_pos_drawing_table import extract_pos_drawing_table
+from multitable_inline.extract_pos_item_table import extract_pos_item_table
+from multitable_inline.simple_2col_table import extract_simple_2col_table
+from multitable_inline.extract_component_list import extract_component_list_table
+from multitable_inline.simple_3col_table import extract_simple_3col_table
+from multitable_inline.extract_alt_id_parts import extract_alt_id_parts
+from multitable_inline.step2_select_tables import is_parts_table
+from multitable_inline.step4_extract_parts import extract_parts
+from multitable_inline.instrumentation import NULL_STATS
+
+
+# ==================================================
+# HEADER INDEX (ONE PER PAGE)
+# ==================================================
+class HeaderIndex:
+    """
+    Per-page lookup shared by every table-type signature.
+
+    Row features (lowercase text, token sets, ...) are built once per
+    row, and each (feature, keyword, row window) lookup is answered
+    once and memoized. Signatures that share a keyword ("item",
+    "description", "qty", ...) share the scan, so adding a table type
+    only adds the keywords it introduces.
+    """
+
+    def __init__(self, page_data, geometry):
+        self.page_data = page_data
+        self.geometry = geometry
+        self.table_type = None
+        self._page_text = None
+        self._features = {}
+        self._hits = {}
+
+    @property
+    def page_text(self):
+        if self._page_text is None:
+            self._page_text = self.page_data.get("page_text", "").lower()
+        return self._page_text
+
+    @property
+    def rows(self):
+        return self.geometry.normalized()["rows"]
+
+    def feature(self, name, i):
+        key = (name, i)
+
+        if key not in self._features:
+            self._features[key] = ROW_FEATURES[name](self.rows[i]["words"])
+
+        return self._features[key]
+
+    def rows_with(self, feature, keyword, limit=None):
+        """
+        Indices of rows (within the first `limit`) whose feature
+        contains keyword. A tuple keyword matches any of its members.
+        """
+        key = (feature, keyword, limit)
+
+        if key not in self._hits:
+            n = len(self.rows) if limit is None else min(limit, len(self.rows))
+            options = keyword if isinstance(keyword, tuple) else (keyword,)
+
+            self._hits[key] = {
+                i for i in range(n)
+                if any(k in self.feature(feature, i) for k in options)
+            }
+
+        return self._hits[key]
+
+    def rows_with_all(self, feature, keywords, limit=None):
+        hits = None
+
+        for kw in keywords:
+            rows = self.rows_with(feature, kw, limit)
+            hits = rows if hits is None else hits & rows
+
+            if not hits:
+                return set()
+
+        return hits
+
+
+# Row features, each computed at most once per row
+ROW_FEATURES = {
+    # "pos qty item name ..." → substring tests
+    "text": lambda words: " ".join(w["text"].lower() for w in words),
+    # same, with dots removed ("No." → "no")
+    "text_nodot": lambda words: " ".join(w["text"].lower().replace(".", "") for w in words),
+    # exact lowercase tokens
+    "tokens": lambda words: {w["text"].lower() for w in words},
+    # exact lowercase tokens, stripped
+    "tokens_strip": lambda words: {w["text"].lower().strip() for w in words},
+    # exact tokens, case-sensitive
+    "tokens_raw": lambda words: {w["text"] for w in words},
+    # exact word sequence
+    "sequence": lambda words: tuple(w["text"] for w in words),
+}
+
+
+# ==================================================
+# HEADER SIGNATURES
+# ==================================================
+class PageTextRegex:
+    """Every pattern must match the lowercase page text."""
+
+    def __init__(self, *patterns):
+        self.patterns = [re.compile(p) for p in patterns]
+
+    def matches(self, index):
+        return all(p.search(index.page_text) for p in self.patterns)
+
+
+class PageTextContains:
+    """Every keyword must occur in the lowercase page text."""
+
+    def __init__(self, *keywords):
+        self.keywords = keywords
+
+    def matches(self, index):
+        return all(k in index.page_text for k in self.keywords)
+
+
+class RowContains:
+    """One row within the first `rows` rows carries every keyword."""
+
+    def __init__(self, *keywords, rows=None, feature="text"):
+        self.keywords = keywords
+        self.rows = rows
+        self.feature = feature
+
+    def matches(self, index):
+        return bool(index.rows_with_all(self.feature, self.keywords, self.rows))
+
+
+class RowEquals:
+    """One row within the first `rows` rows is exactly this word sequence."""
+
+    def __init__(self, *words, rows=None):
+        self.words = tuple(words)
+        self.rows = rows
+
+    def matches(self, index):
+        n = len(index.rows) if self.rows is None else min(self.rows, len(index.rows))
+        return any(index.feature("sequence", i) == self.words for i in range(n))
+
+
+class RowPair:
+    """Two adjacent rows carry the first and second keyword sets."""
+
+    def __init__(self, first, second, feature="text"):
+        self.first = first
+        self.second = second
+        self.feature = feature
+
+    def matches(self, index):
+        tops = index.rows_with_all(self.feature, self.first)
+
+        if not tops:
+            return False
+
+        bottoms = index.rows_with_all(self.feature, self.second)
+        return any(i + 1 in bottoms for i in tops)
+
+
+class Step2Type:
+    """is_parts_table returned this table type."""
+
+    def __init__(self, table_type):
+        self.table_type = table_type
+
+    def matches(self, index):
+        return index.table_type == self.table_type
+
+
+# ==================================================
+# TABLE-TYPE REGISTRY
+# ==================================================
+class TableType:
+
+    def __init__(self, name, extractor, signature, requires_parts_table=True):
+        self.name = name
+        self.extractor = extractor
+        self.signature = signature
+        self.requires_parts_table = requires_parts_table
+
+
+# Checked in order; the first matching signature wins.
+# Types with requires_parts_table=False are probed before step 2.
+TABLE_TYPES = [
+    TableType(
+        "MARK",
+        extract_mark_table,
+        PageTextRegex(r"\bmark\b", r"\bdwg\b", r"\bdescription\b"),
+        requires_parts_table=False
+    ),
+    TableType(
+        "POS-ITEM",
+        extract_pos_item_table,
+        RowContains("pos", "qty", "item name", "item no", "drawing reference", rows=15),
+        requires_parts_table=False
+    ),
+    TableType(
+        "SIMPLE 3COL",
+        extract_simple_3col_table,
+        PageTextContains("qty", "part number", "description"),
+        requires_parts_table=False
+    ),
+    TableType(
+        "COMPONENT LIST",
+        extract_component_list_table,
+        RowContains(
+            "Level", "Material", "Disc.", "BOM", "item", "Description", "Remarks",
+            rows=12,
+            feature="tokens_raw"
+        )
+    ),
+    TableType(
+        "ALT-ID",
+        extract_alt_id_parts,
+        Step2Type("ALT_ID_TABLE")
+    ),
+    TableType(
+        "SIMPLE 2COL",
+        extract_simple_2col_table,
+        Step2Type("SIMPLE_2COL_TABLE")
+    ),
+    TableType(
+        "POS-DRAW",
+        extract_pos_drawing_table,
+        RowContains("item name/technical", rows=12)
+    ),
+    TableType(
+        "ARTICLE-NUMBER",
+        extract_article_number_table,
+        RowContains("article", "number", "description", "certificate", rows=15, feature="text_nodot")
+    ),
+    TableType(
+        "SINGLE LEVEL BOM",
+        extract_single_level_bom,
+        RowContains("no.", "item", "rev", "description", rows=12, feature="tokens_strip")
+    ),
+    TableType(
+        "SPLIT HEADER",
+        extract_split_header_item_part_table,
+        RowPair(("item", "part"), ("number", "qty.", "description"), feature="tokens")
+    ),
+    TableType(
+        "BALLOON BOM",
+        extract_balloon_bom_table,
+        RowPair(("balloon", "part"), ("number", "rev", "description"))
+    ),
+    TableType(
+        "RECOMMENDED SPARES",
+        extract_recommended_spares_table,
+        RowEquals("Parts", "List", "Item", "Qty", "Description", "PMH", "Part", "No", rows=12)
+    ),
+    TableType(
+        "PMH/MOS",
+        extract_pmh_mos_table,
+        RowContains("item", "qty", "description", ("pmh part no", "mos part no"), rows=8)
+    ),
+]
+
+# Accepted by step 2 but no specific signature matched
+NORMAL_TABLE = TableType("NORMAL", extract_parts, None)
+
+
+def classify_page(page_data, geometry, debug=False, stats=NULL_STATS):
+    """
+    Pick the table type for a page.
+
+    Returns the winning TableType, or None when the page is not a
+    parts table (inline P/N extraction applies).
+    """
+
+    index = HeaderIndex(page_data, geometry)
+    step2_done = False
+
+    for table_type in TABLE_TYPES:
+
+        if table_type.requires_parts_table and not step2_done:
+            with stats.stage("step2.is_parts_table"):
+                index.table_type = is_parts_table(page_data, debug=debug, geometry=geometry)
+            step2_done = True
+
+            if not index.table_type:
+                return None
+
+        if table_type.signature.matches(index):
+            return table_type
+
+    return NORMAL_TABLE
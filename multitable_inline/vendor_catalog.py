@@ -0,0 +1,186 @@
+import csv
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from multitable_inline.vendor_matcher import VendorMatcher
+
+
+# Seconds between file checks; lookups in between reuse the current index
+RELOAD_CHECK_INTERVAL = 2.0
+
+ALIAS_SEPARATOR = "|"
+
+
+def normalize_vendor_text(text):
+    """Case- and spacing-insensitive form used for both catalog names and page text."""
+    return " ".join(text.upper().split())
+
+
+# ==================================================
+# CATALOG FILE READERS
+# ==================================================
+def _split_aliases(value):
+    if not value:
+        return []
+    if isinstance(value, str):
+        value = value.split(ALIAS_SEPARATOR)
+    return [a.strip() for a in value if a and a.strip()]
+
+
+def _read_csv(path):
+    # name,aliases   (aliases separated by "|")
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        for row in csv.DictReader(f):
+            yield row.get("name", ""), _split_aliases(row.get("aliases"))
+
+
+def _read_json(path):
+    # ["NAME", ...] or [{"name": "NAME", "aliases": [...]}, ...]
+    with open(path, "r", encoding="utf-8") as f:
+        entries = json.load(f)
+
+    for entry in entries:
+        if isinstance(entry, str):
+            yield entry, []
+        else:
+            yield entry.get("name", ""), _split_aliases(entry.get("aliases"))
+
+
+def _read_sqlite(path):
+    # vendors(name TEXT, aliases TEXT), in rowid order
+    with sqlite3.connect(f"file:{path}?mode=ro", uri=True) as conn:
+        rows = conn.execute("SELECT name, aliases FROM vendors ORDER BY rowid").fetchall()
+
+    for name, aliases in rows:
+        yield name, _split_aliases(aliases)
+
+
+CATALOG_READERS = {
+    ".csv": _read_csv,
+    ".json": _read_json,
+    ".db": _read_sqlite,
+    ".sqlite": _read_sqlite,
+    ".sqlite3": _read_sqlite,
+}
+
+
+def read_catalog(path):
+    """[(name, [aliases])] in file order, from a CSV, JSON or SQLite catalog."""
+
+    ext = os.path.splitext(path)[1].lower()
+    reader = CATALOG_READERS.get(ext)
+
+    if reader is None:
+        raise ValueError(
+            f"Unsupported vendor catalog {path!r}; expected one of: {', '.join(sorted(CATALOG_READERS))}"
+        )
+
+    return [(name.strip(), aliases) for name, aliases in reader(path) if name and name.strip()]
+
+
+# ==================================================
+# INDEXED, HOT-RELOADABLE CATALOG
+# ==================================================
+class _Index:
+    """One immutable snapshot: a matcher over normalized names and aliases."""
+
+    def __init__(self, entries):
+        self.names = {}
+        keys = []
+
+        # Earlier entries win; each entry's name comes before its aliases
+        for name, aliases in entries:
+            for alias in [name] + list(aliases):
+                key = normalize_vendor_text(alias)
+                if key and key not in self.names:
+                    self.names[key] = name
+                    keys.append(key)
+
+        self.matcher = VendorMatcher(keys)
+        self.size = len(entries)
+
+
+class VendorCatalog:
+    """
+    Vendor names and aliases, indexed once per load for one-pass,
+    case-insensitive whole-word lookup in page text. Every entry is
+    matched, so the catalog should not list common words ("Derrick",
+    "Vertical") as vendor names.
+
+    Built from a catalog file (see read_catalog), the file is checked
+    for changes at most every check_interval seconds and reloaded in
+    place, so long-running processes (the Streamlit app) pick up edits
+    without a restart. A file that fails to load keeps the previous
+    index.
+
+        catalog = VendorCatalog("vendors.csv")
+        catalog.match("... QUINCY COMPRESSOR ...")   # ("QUINCY", "QUINCY")
+    """
+
+    def __init__(self, path=None, check_interval=RELOAD_CHECK_INTERVAL, entries=None):
+        self.path = path
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._stamp = None
+        self._checked = 0.0
+        self._index = _Index(entries or [])
+
+        if path:
+            self.reload()
+
+    @classmethod
+    def from_names(cls, names):
+        """In-memory catalog (no file, no reloads) from a list of names."""
+        return cls(entries=[(name, []) for name in names if name])
+
+    def __len__(self):
+        return self._current().size
+
+    def _file_stamp(self):
+        st = os.stat(self.path)
+        return st.st_mtime_ns, st.st_size
+
+    def reload(self):
+        """Re-read the catalog file if it changed. Returns True when reloaded."""
+
+        with self._lock:
+            self._checked = time.monotonic()
+
+            try:
+                stamp = self._file_stamp()
+                if stamp == self._stamp:
+                    return False
+
+                # A broken file is reported once, not on every check
+                self._stamp = stamp
+                self._index = _Index(read_catalog(self.path))
+
+            except (OSError, ValueError, sqlite3.Error) as e:
+                print(f"[VENDORS] Could not load {self.path}: {e}")
+                return False
+
+        print(f"[VENDORS] Loaded {self._index.size} vendors from {self.path}")
+        return True
+
+    def _current(self):
+        if self.path and time.monotonic() - self._checked >= self.check_interval:
+            self.reload()
+        return self._index
+
+    def match(self, text, whole_words=True):
+        """
+        (vendor name, matched normalized key) for the earliest catalog
+        entry found in text, or (None, None). whole_words=False also
+        accepts names inside longer words (see VendorMatcher).
+        """
+
+        index = self._current()
+        key = index.matcher.first_in(normalize_vendor_text(text), whole_words=whole_words)
+
+        if key is None:
+            return None, None
+
+        return index.names[key], key
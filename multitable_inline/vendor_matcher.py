@@ -0,0 +1,121 @@
+from collections import deque
+
+
+# ==================================================
+# MULTI-PATTERN VENDOR MATCHER (AHO-CORASICK)
+# ==================================================
+class VendorMatcher:
+    """
+    Finds which catalog vendors occur in a text in one pass over the
+    text, whatever the catalog size.
+
+    The automaton is built once from the vendor names. first_in()
+    returns the earliest catalog entry found in the text as a whole
+    word: an occurrence only counts when the characters around it are
+    not alphanumeric (for names that start / end with one), so
+    "DERRICK" doesn't match "DERRICKS" and "EATON" doesn't match
+    "BEATON". With whole_words=False any occurrence counts (filenames,
+    where the vendor is often glued to the model: "QUINCYQR370").
+    Matching itself is case-sensitive.
+    """
+
+    def __init__(self, vendors):
+        self.vendors = []
+
+        # Trie: per node, char → child node; out = vendor indices
+        # ending at this node or any of its suffixes (via fail links),
+        # lowest first
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [[]]
+
+        seen = set()
+
+        for vendor in vendors:
+            # Duplicates can never win over their first occurrence
+            if not vendor or vendor in seen:
+                continue
+            seen.add(vendor)
+            self._add(vendor, len(self.vendors))
+            self.vendors.append(vendor)
+
+        self._link()
+
+    def __len__(self):
+        return len(self.vendors)
+
+    def _add(self, vendor, index):
+        node = 0
+
+        for ch in vendor:
+            child = self._goto[node].get(ch)
+
+            if child is None:
+                child = len(self._goto)
+                self._goto[node][ch] = child
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+
+            node = child
+
+        self._out[node].append(index)
+
+    def _link(self):
+        goto, fail, out = self._goto, self._fail, self._out
+        queue = deque(goto[0].values())
+
+        while queue:
+            node = queue.popleft()
+
+            for ch, child in goto[node].items():
+                f = fail[node]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+
+                fail[child] = goto[f].get(ch, 0)
+
+                # Fail targets are shallower, so already complete
+                if out[fail[child]]:
+                    out[child] = sorted(out[child] + out[fail[child]])
+
+                queue.append(child)
+
+    def _whole_word(self, text, end, index):
+        # The occurrence of vendor `index` ending at text[end]
+        vendor = self.vendors[index]
+        start = end - len(vendor) + 1
+
+        if vendor[0].isalnum() and start > 0 and text[start - 1].isalnum():
+            return False
+
+        if vendor[-1].isalnum() and end + 1 < len(text) and text[end + 1].isalnum():
+            return False
+
+        return True
+
+    def first_in(self, text, whole_words=True):
+        """Lowest-index catalog vendor occurring in text (as a whole word), or None."""
+
+        goto, fail, out = self._goto, self._fail, self._out
+        node = 0
+        found = None
+
+        for i, ch in enumerate(text):
+            while node and ch not in goto[node]:
+                node = fail[node]
+
+            node = goto[node].get(ch, 0)
+
+            for hit in out[node]:
+                if found is not None and hit >= found:
+                    break
+
+                if not whole_words or self._whole_word(text, i, hit):
+                    found = hit
+                    break
+
+            if found == 0:
+                break
+
+        return None if found is None else self.vendors[found]
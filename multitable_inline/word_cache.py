@@ -0,0 +1,236 @@
+import json
+import os
+import tempfile
+from collections.abc import Sequence
+
+import numpy as np
+
+from multitable_inline.result_cache import DEFAULT_CACHE_DIR, file_sha256
+
+
+# Numeric word geometry; text and fontname live in side tables
+WORD_DTYPE = np.dtype([
+    ("x0", "f8"),
+    ("x1", "f8"),
+    ("top", "f8"),
+    ("bottom", "f8"),
+    ("size", "f8"),
+    ("text_start", "i8"),
+    ("text_end", "i8"),
+    ("font", "i4"),
+])
+
+
+def _atomic_write(path, write):
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    os.close(fd)
+
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+# ==================================================
+# LAZY, MEMORY-MAPPED WORD LIST
+# ==================================================
+class CachedWords(Sequence):
+    """
+    Word list backed by memory-mapped page arrays.
+
+    Behaves like the list of word dicts from pdfplumber. Nothing is
+    read from disk until the first access; the dicts are then built
+    once and reused.
+    """
+
+    def __init__(self, array_path, text_path, fonts, n_words):
+        self._array_path = array_path
+        self._text_path = text_path
+        self._fonts = fonts
+        self._n_words = n_words
+        self._words = None
+
+    def _load(self):
+        if self._words is None:
+            arr = np.load(self._array_path, mmap_mode="r")
+            blob = np.load(self._text_path, mmap_mode="r").tobytes()
+            fonts = self._fonts
+
+            self._words = [
+                {
+                    "text": blob[r["text_start"]:r["text_end"]].decode("utf-8"),
+                    "x0": float(r["x0"]),
+                    "x1": float(r["x1"]),
+                    "top": float(r["top"]),
+                    "bottom": float(r["bottom"]),
+                    "size": float(r["size"]),
+                    "fontname": fonts[r["font"]],
+                }
+                for r in arr
+            ]
+
+        return self._words
+
+    def __len__(self):
+        return self._n_words
+
+    def __getitem__(self, i):
+        return self._load()[i]
+
+    def __iter__(self):
+        return iter(self._load())
+
+    def __bool__(self):
+        return self._n_words > 0
+
+    def __reduce__(self):
+        # Pickled (e.g. to a worker process) as a plain list
+        return (list, (self._load(),))
+
+
+# ==================================================
+# PER-DOCUMENT STORE
+# ==================================================
+class CachedDocument:
+    """
+    Per-page word geometry of one PDF, stored as:
+
+        <hash>/document.json     document-level metadata (page count)
+        <hash>/p<N>.json         fonts, word count
+        <hash>/p<N>.words.npy    WORD_DTYPE array
+        <hash>/p<N>.text.npy     UTF-8 text blob (uint8)
+
+    p<N>.json is written last and marks the page as complete.
+    """
+
+    def __init__(self, doc_dir):
+        self.doc_dir = doc_dir
+        os.makedirs(doc_dir, exist_ok=True)
+
+    def _path(self, name):
+        return os.path.join(self.doc_dir, name)
+
+    def get_meta(self, key):
+        try:
+            with open(self._path("document.json"), "r", encoding="utf-8") as f:
+                return json.load(f).get(key)
+        except (OSError, ValueError):
+            return None
+
+    def set_meta(self, key, value):
+        path = self._path("document.json")
+
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            meta = {}
+
+        meta[key] = value
+
+        def write(tmp):
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(meta, f)
+
+        _atomic_write(path, write)
+
+    def has_page(self, page_no):
+        return os.path.exists(self._path(f"p{page_no}.json"))
+
+    def load_page(self, page_no):
+        """
+        Returns the page's words as a CachedWords sequence; empty
+        pages return an empty list.
+        """
+        with open(self._path(f"p{page_no}.json"), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+
+        if not meta["n_words"]:
+            return []
+
+        words = CachedWords(
+            self._path(f"p{page_no}.words.npy"),
+            self._path(f"p{page_no}.text.npy"),
+            meta["fonts"],
+            meta["n_words"]
+        )
+
+        return words
+
+    def store_page(self, page_no, words):
+        fonts = []
+        font_ids = {}
+        blob = bytearray()
+
+        arr = np.zeros(len(words), dtype=WORD_DTYPE)
+
+        for i, w in enumerate(words):
+            encoded = w["text"].encode("utf-8")
+            fontname = w.get("fontname", "")
+
+            if fontname not in font_ids:
+                font_ids[fontname] = len(fonts)
+                fonts.append(fontname)
+
+            arr[i] = (
+                w["x0"],
+                w["x1"],
+                w["top"],
+                w["bottom"],
+                w.get("size", 0.0),
+                len(blob),
+                len(blob) + len(encoded),
+                font_ids[fontname],
+            )
+            blob.extend(encoded)
+
+        if words:
+            _atomic_write(
+                self._path(f"p{page_no}.words.npy"),
+                lambda tmp: _save_npy(tmp, arr)
+            )
+            _atomic_write(
+                self._path(f"p{page_no}.text.npy"),
+                lambda tmp: _save_npy(tmp, np.frombuffer(bytes(blob) or b"\0", dtype=np.uint8))
+            )
+
+        meta = {
+            "n_words": len(words),
+            "fonts": fonts,
+        }
+
+        def write(tmp):
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(meta, f)
+
+        _atomic_write(self._path(f"p{page_no}.json"), write)
+
+
+def _save_npy(path, arr):
+    # np.save appends ".npy" to names without it; write via a handle
+    with open(path, "wb") as f:
+        np.save(f, arr)
+
+
+class WordCache:
+    """
+    Persistent per-page word cache keyed by PDF content hash and page
+    number. Lets extractor heuristics be re-run on a corpus without
+    parsing the PDFs again.
+    """
+
+    def __init__(self, cache_dir=None):
+        self.cache_dir = cache_dir or os.path.join(DEFAULT_CACHE_DIR, "words")
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def document(self, pdf_path, pdf_hash=None, engine=None):
+        name = pdf_hash or file_sha256(pdf_path)
+
+        # Word geometry differs slightly between backends
+        if engine and engine != "pdfplumber":
+            name = f"{name}-{engine}"
+
+        return CachedDocument(os.path.join(self.cache_dir, name))
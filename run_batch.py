@@ -0,0 +1,418 @@
+"""
+Batch mode: extract parts from a directory (or glob) of manuals.
+
+Every page range of every document is scheduled on one shared process
+pool, biggest documents first and split into page shards, so a single
+huge manual keeps all workers busy instead of one.
+
+Output is either one set of files per manual, or one consolidated
+dataset (--combined) with a filename column. Finished documents are
+logged to batch_progress.jsonl in the output directory; re-running
+the same command skips them, so an interrupted batch resumes where it
+stopped.
+
+Usage:
+    python run_batch.py "manuals/*.pdf" --out out/ [--combined]
+        [--formats xlsx csv parquet ndjson] [--workers 4] [--engine pymupdf]
+"""
+
+import argparse
+import glob
+import hashlib
+import json
+import os
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from multitable_inline.result_cache import file_sha256
+from multitable_inline.step1_extract_tables import count_pages, get_engine
+from multitable_inline.step5_export import open_writers, resolve_formats
+from run_pipeline import _iter_merged_pages, _process_page_shard, detect_vendor_model
+
+
+PROGRESS_FILE = "batch_progress.jsonl"
+
+# Per-document parts of a --combined batch, kept until the final merge
+SPOOL_DIR = ".batch_parts"
+
+COMBINED_NAME = "combined"
+
+MAX_SHARD_PAGES = 50
+
+
+def find_pdfs(source):
+    """Sorted PDF paths under a directory (recursively) or matching a glob."""
+
+    if os.path.isdir(source):
+        paths = glob.glob(os.path.join(source, "**", "*"), recursive=True)
+    else:
+        paths = glob.glob(source, recursive=True)
+
+    return sorted({
+        os.path.abspath(p)
+        for p in paths
+        if p.lower().endswith(".pdf") and os.path.isfile(p)
+    })
+
+
+def _doc_id(pdf_path):
+    # A changed file (size or mtime) is processed again
+    st = os.stat(pdf_path)
+    return f"{pdf_path}|{st.st_size}|{st.st_mtime_ns}"
+
+
+def _output_names(pdf_paths):
+    """Unique output base name per PDF (file stem, suffixed on clashes)."""
+
+    names = {}
+    used = defaultdict(int)
+
+    for pdf_path in pdf_paths:
+        stem = os.path.splitext(os.path.basename(pdf_path))[0]
+        used[stem] += 1
+        names[pdf_path] = stem if used[stem] == 1 else f"{stem}-{used[stem]}"
+
+    return names
+
+
+# ==================================================
+# RESUMABLE PROGRESS LOG
+# ==================================================
+class BatchProgress:
+    """
+    Append-only JSON Lines log of finished documents. Each record is
+    flushed to disk as soon as its document is written, so a crash
+    loses at most the documents in flight.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.records = {}
+
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        # Torn last line from an interrupted write
+                        continue
+                    self.records[record["doc"]] = record
+
+    def is_done(self, doc_id):
+        record = self.records.get(doc_id)
+        return bool(record) and record["status"] == "done"
+
+    def record(self, doc_id, **fields):
+        record = {"doc": doc_id, **fields}
+        self.records[doc_id] = record
+
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+
+# ==================================================
+# SCHEDULING
+# ==================================================
+def _plan_shards(page_counts, workers):
+    """
+    (pdf_path, page_numbers) tasks covering every page of every
+    document. Shards are sized for ~8 per worker over the whole batch
+    (capped at MAX_SHARD_PAGES) and ordered biggest document first.
+    """
+
+    total = sum(page_counts.values())
+    shard_pages = max(1, min(MAX_SHARD_PAGES, -(-total // (max(1, workers or 1) * 8))))
+
+    tasks = []
+
+    for pdf_path, n_pages in sorted(page_counts.items(), key=lambda kv: -kv[1]):
+        for start in range(1, n_pages + 1, shard_pages):
+            tasks.append((pdf_path, list(range(start, min(n_pages, start + shard_pages - 1) + 1))))
+
+    return tasks
+
+
+def _iter_shard_results(tasks, workers, debug=False, word_cache=None, engine=None, pdf_hashes=None):
+    """
+    Yields (task, shard, error) as shards finish, in any order.
+    pdf_hashes (pdf_path → digest) saves each shard re-hashing its
+    document for the word cache.
+    """
+
+    pdf_hashes = pdf_hashes or {}
+
+    def args(task):
+        return task[0], task[1], None, debug, word_cache, pdf_hashes.get(task[0]), engine
+
+    if not workers or workers <= 1:
+        for task in tasks:
+            try:
+                yield task, _process_page_shard(*args(task)), None
+            except Exception as e:
+                yield task, None, e
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(_process_page_shard, *args(task)): task
+            for task in tasks
+        }
+
+        for future in as_completed(futures):
+            try:
+                yield futures[future], future.result(), None
+            except Exception as e:
+                yield futures[future], None, e
+
+
+# ==================================================
+# BATCH RUN
+# ==================================================
+def run_batch(
+    source,
+    out_dir,
+    output_formats=("xlsx",),
+    combined=False,
+    workers=None,
+    vendor=None,
+    model=None,
+    project=None,
+    subproject=None,
+    equipment=None,
+    engine=None,
+    word_cache=None,
+    debug=False
+):
+    """
+    Process every PDF under source (directory or glob) into out_dir.
+
+    Per-file mode writes <name>.<format> per manual; combined mode
+    writes combined.<format> with a filename column once every
+    document is done. vendor/model override per-document detection.
+
+    Returns the progress records of this batch's documents.
+    """
+
+    output_formats = resolve_formats(output_formats)
+    get_engine(engine)
+
+    os.makedirs(out_dir, exist_ok=True)
+
+    pdf_paths = find_pdfs(source)
+    names = _output_names(pdf_paths)
+    root = os.path.commonpath([os.path.dirname(p) for p in pdf_paths]) if pdf_paths else ""
+    doc_ids = {p: _doc_id(p) for p in pdf_paths}
+
+    progress = BatchProgress(os.path.join(out_dir, PROGRESS_FILE))
+    spool_dir = os.path.join(out_dir, SPOOL_DIR)
+
+    if combined:
+        os.makedirs(spool_dir, exist_ok=True)
+
+    todo = [p for p in pdf_paths if not progress.is_done(doc_ids[p])]
+
+    print(f"[BATCH] {len(pdf_paths)} PDFs, {len(pdf_paths) - len(todo)} already done")
+
+    # ----------------------------------------------
+    # Plan page shards across all pending documents
+    # ----------------------------------------------
+    page_counts = {}
+
+    # The word cache is keyed by content hash: hash each document once
+    pdf_hashes = {}
+
+    for pdf_path in todo:
+        try:
+            n_pages = count_pages(pdf_path)
+
+            if word_cache is not None:
+                pdf_hashes[pdf_path] = file_sha256(pdf_path)
+
+            page_counts[pdf_path] = n_pages
+
+        except Exception as e:
+            print(f"[BATCH] {names[pdf_path]} | Cannot open: {e}")
+            progress.record(doc_ids[pdf_path], pdf=pdf_path, status="failed", error=str(e))
+
+    tasks = _plan_shards(page_counts, workers)
+
+    remaining = defaultdict(int)
+    for pdf_path, _ in tasks:
+        remaining[pdf_path] += 1
+
+    shard_results = defaultdict(dict)
+    errors = {}
+    started = time.time()
+
+    def finish_document(pdf_path):
+        shards = shard_results.pop(pdf_path, {})
+        doc_id = doc_ids[pdf_path]
+
+        if pdf_path in errors:
+            print(f"[BATCH] {names[pdf_path]} | Failed: {errors[pdf_path]}")
+            progress.record(doc_id, pdf=pdf_path, status="failed", error=str(errors.pop(pdf_path)))
+            return
+
+        ordered = [shards[start] for start in sorted(shards)]
+
+        head = None
+        pages_scanned = 0
+        parts = []
+
+        for head, extracted_parts in _iter_merged_pages(ordered):
+            pages_scanned += 1
+            parts.extend(extracted_parts)
+
+        doc_vendor, doc_model = detect_vendor_model(pdf_path, head, vendor, model)
+
+        if combined:
+            spool_name = hashlib.sha1(doc_id.encode()).hexdigest()[:16]
+            spool_path = os.path.join(spool_dir, spool_name + ".json")
+
+            with open(spool_path, "w", encoding="utf-8") as f:
+                json.dump({
+                    "vendor": doc_vendor,
+                    "model": doc_model,
+                    "pages_scanned": pages_scanned,
+                    "parts": parts,
+                }, f)
+
+            outputs = [spool_path]
+
+        else:
+            writers = open_writers(
+                os.path.join(out_dir, names[pdf_path]),
+                output_formats,
+                vendor=doc_vendor,
+                model=doc_model,
+                project=project,
+                subproject=subproject,
+                equipment=equipment,
+                pdf_path=pdf_path
+            )
+
+            for writer in writers:
+                writer.write(parts)
+
+            outputs = [writer.close(pages_scanned) for writer in writers]
+
+        progress.record(
+            doc_id,
+            pdf=pdf_path,
+            status="done",
+            pages=pages_scanned,
+            parts=len(parts),
+            outputs=outputs
+        )
+
+        print(
+            f"[BATCH] {names[pdf_path]} | {pages_scanned} pages, {len(parts)} parts "
+            f"({time.time() - started:.1f}s elapsed)"
+        )
+
+    # ----------------------------------------------
+    # Run all shards on the shared pool
+    # ----------------------------------------------
+    for (pdf_path, page_numbers), shard, error in _iter_shard_results(
+        tasks,
+        workers,
+        debug=debug,
+        word_cache=word_cache,
+        engine=engine,
+        pdf_hashes=pdf_hashes
+    ):
+        if error is not None:
+            errors.setdefault(pdf_path, error)
+        else:
+            shard_results[pdf_path][page_numbers[0]] = shard
+
+        remaining[pdf_path] -= 1
+
+        if not remaining[pdf_path]:
+            finish_document(pdf_path)
+
+    # ----------------------------------------------
+    # Consolidated dataset (every finished document)
+    # ----------------------------------------------
+    if combined:
+        writers = open_writers(
+            os.path.join(out_dir, COMBINED_NAME),
+            output_formats,
+            project=project,
+            subproject=subproject,
+            equipment=equipment,
+            combined=True
+        )
+
+        pages_scanned = 0
+
+        for pdf_path in pdf_paths:
+            record = progress.records.get(doc_ids[pdf_path])
+
+            if not record or record["status"] != "done":
+                continue
+
+            with open(record["outputs"][0], "r", encoding="utf-8") as f:
+                spooled = json.load(f)
+
+            for writer in writers:
+                writer.start_document(
+                    pdf_path,
+                    spooled["vendor"],
+                    spooled["model"],
+                    # Relative path: same-named manuals stay apart
+                    filename=os.path.relpath(pdf_path, root)
+                )
+                writer.write(spooled["parts"])
+
+            pages_scanned += spooled["pages_scanned"]
+
+        for writer in writers:
+            print(f"[BATCH] Combined output written to {writer.close(pages_scanned)}")
+
+    return [progress.records[doc_ids[p]] for p in pdf_paths if doc_ids[p] in progress.records]
+
+
+# ==================================================
+# CLI
+# ==================================================
+def main():
+    parser = argparse.ArgumentParser(description="Batch parts extraction")
+    parser.add_argument("source", help="directory of PDFs or a glob pattern")
+    parser.add_argument("--out", required=True, help="output directory")
+    parser.add_argument("--formats", nargs="+", default=["xlsx"])
+    parser.add_argument("--combined", action="store_true", help="one consolidated dataset")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--engine", default=None)
+    parser.add_argument("--vendor")
+    parser.add_argument("--model")
+    parser.add_argument("--project")
+    parser.add_argument("--subproject")
+    parser.add_argument("--equipment")
+    args = parser.parse_args()
+
+    records = run_batch(
+        args.source,
+        args.out,
+        output_formats=args.formats,
+        combined=args.combined,
+        workers=args.workers,
+        vendor=args.vendor,
+        model=args.model,
+        project=args.project,
+        subproject=args.subproject,
+        equipment=args.equipment,
+        engine=args.engine
+    )
+
+    failed = [r for r in records if r["status"] != "done"]
+
+    print(f"[BATCH] {len(records) - len(failed)} done, {len(failed)} failed")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,99 +1,69 @@
-from collections import defaultdict, Counter
-from openpyxl import Workbook
+from concurrent.futures import ProcessPoolExecutor
+import itertools
 import os,re
-from multitable_inline.extract_mark_table import extract_mark_table
-from multitable_inline.extract_pmh_mos_table import extract_pmh_mos_table
-from multitable_inline.extract_balloon_bom_table import extract_balloon_bom_table
-from multitable_inline.extract_recommended_spares_table import extract_recommended_spares_table
-from multitable_inline.extract_split_header_item_part_table import extract_split_header_item_part_table
-from multitable_inline.extract_single_level_bom import extract_single_level_bom
-from multitable_inline.extract_article_number_table import extract_article_number_table
-from multitable_inline.extract_pos_drawing_table import extract_pos_drawing_table
-from multitable_inline.extract_pos_item_table import extract_pos_item_table
-from multitable_inline.simple_2col_table import extract_simple_2col_table
-from multitable_inline.extract_component_list import extract_component_list_table
-from multitable_inline.simple_3col_table import extract_simple_3col_table
-from multitable_inline.step1_extract_tables import extract_table_candidates
-from multitable_inline.step2_select_tables import is_parts_table
-from multitable_inline.step3_geometry_normalize import normalize_table
-from multitable_inline.step4_extract_parts import extract_parts
+import time
+from multitable_inline.step1_extract_tables import (
+    DEFAULT_ENGINE,
+    count_pages,
+    get_engine,
+    iter_page_candidates,
+    nearest_page_before,
+    pages_to_extract,
+)
+from multitable_inline.step3_geometry_normalize import PageGeometry
+from multitable_inline.table_types import classify_page
 from multitable_inline.inline_pn_extractor import extract_inline_pns
-from multitable_inline.extract_alt_id_parts import extract_alt_id_parts
 from multitable_inline.patterns import PART_NO_REGEX
+from multitable_inline.provenance import finalize_traces
 from multitable_inline.title_extractor import (extract_page_title, extract_prev_page_title)
+from multitable_inline.result_cache import file_sha256, source_fingerprint
+from multitable_inline.step5_export import XlsxPartsWriter, open_writers, resolve_formats
+from multitable_inline.instrumentation import NULL_STATS, PipelineStats, report_rows
+from multitable_inline.vendor_catalog import VendorCatalog, normalize_vendor_text
+
+# Changes whenever the extraction code changes (result cache key)
+PIPELINE_VERSION = source_fingerprint(os.path.abspath(__file__))
+
+# Vendor catalog (name,aliases CSV; JSON and SQLite also accepted).
+# Edits are picked up by running processes without a restart.
+VENDOR_CATALOG_PATH = os.environ.get(
+    "VENDOR_CATALOG",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "vendors.csv")
+)
+
+KNOWN_VENDORS = VendorCatalog(VENDOR_CATALOG_PATH)
+
+
+def vendor_catalog(known_vendors):
+    """known_vendors as a VendorCatalog (a plain list is indexed on the fly)."""
 
-KNOWN_VENDORS = [
-    "INGERSOLL RAND",
-    "Marlow Pumps",
-    "DECKMA HAMBURG GmbH",
-    "Cameron",
-    "NEUHAUS",
-    "Expro",
-    "HANNON HYDRAULICS",
-    "WILO",
-    "VETCOGRAY",
-    "GE OIL & GAS",
-    "Dropsafe",
-    "PHAROS MARINE AUTOMATIC POWER",
-    "NOV",
-    "Survival Systems",
-    "BIRDDONG ASSOCIATES INC",
-    "Letourneau",
-    "FEDERAL SIGNAL",
-    "EMERSON",
-    "QUINCY",
-    "RAM WINCH HOIST",
-    "GE Oil and Gas",
-    "Bauer Kompressoren",
-    "Eaton",
-    "SOUTHERN AVIONICS COMPANY",
-    "LOADMASTER INDUSTRIES Broussard",
-    "NATIONAL OILWELL VARCO",
-    "LOADMASTER DERRICK",
-    "JOHNSON",
-    "ALSTOM",
-    "Conver team",
-    "IEC System",
-    "cameron",
-    "GENERAL MONITORS",
-    "peerless Pump",
-    "KIDDE FIRE SYSTEM",
-    "Dooley Tackaberry Systems",
-    "ALFA LAVAL TUMBA AB",
-    "Roper Pump Company",
-    "Dooley Tackaberry",
-    "ANSUL",
-    "LEWCO",
-    "DOUBLE LIFE",
-    "LTI TECHNOLOGIES",
-    "TOTCO",
-    "HARWIL",
-    "T3 ENERGY SERVICES",
-    "IMECO",
-    "NANCE INTERNATIONAL, INC.",
-    "CARRIER",
-    "EPIC",
-    "AXIOM",
-    "Derrick",
-    "CATERPILLAR.INC",
-    "RECOVERED ENERGY .INC",
-    "Federal Signal Corporation",
-    "AQUAFINEUV",
-    "SPECIFIC EQUIPMENT COMPANY1",
-    "Hadar Lighting",
-    "MURPHY",
-    "KODEN",
-    "JORTON",
-    "ALSTOM",
-    "Woolslayer",
-    "DOOLEYTAKEBERRY Inc",
-    "ALFA LAVAL",
-    "BESLER ELECTRIC",
-    "PepperL",
-    "Signal International",
-    "Vertical",
-    "WILKERSON"
-]
+    if isinstance(known_vendors, VendorCatalog):
+        return known_vendors
+
+    return VendorCatalog.from_names(known_vendors)
+
+# Filename separators folded to spaces before vendor matching
+FILENAME_SEPARATOR_REGEX = re.compile(r"[_\-]+")
+
+# First-page line prefixes that introduce a model value. Alternation
+# order is priority order ("MODEL" before "MODEL NO"); the keyword and
+# an optional ":" or "-" are dropped from the value.
+MODEL_KEYWORDS = (
+    "MODEL",
+    "SERIES",
+    "PROJECT",
+    "TYPE",
+    "CODE",
+    "P/N",
+    "PN",
+    "PART NO",
+    "MODEL NO",
+)
+
+MODEL_LINE_REGEX = re.compile(
+    r"^(?:" + "|".join(re.escape(kw) for kw in MODEL_KEYWORDS) + r")\s*[:\-]?\s*",
+    re.IGNORECASE
+)
 
 def detect_vendor_from_filename(pdf_path, pages_data, known_vendors):
     """
@@ -107,7 +77,7 @@ def detect_vendor_from_filename(pdf_path, pages_data, known_vendors):
     # -----------------------------
     # First page text
     # -----------------------------
-    first_page_text = pages_data[0].get("page_text", "").upper()
+    first_page_text = normalize_vendor_text(pages_data[0].get("page_text", ""))
 
     # -----------------------------
     # Extract filename
@@ -116,7 +86,7 @@ def detect_vendor_from_filename(pdf_path, pages_data, known_vendors):
     name = os.path.splitext(filename)[0]
 
     # Normalize
-    clean_name = re.sub(r"[_\-]+", " ", name).upper().strip()
+    clean_name = normalize_vendor_text(FILENAME_SEPARATOR_REGEX.sub(" ", name))
     parts = clean_name.split()
 
     if not parts:
@@ -125,17 +95,14 @@ def detect_vendor_from_filename(pdf_path, pages_data, known_vendors):
     # -----------------------------
     # Try matching known vendor
     # -----------------------------
-    vendor = None
     model = None
 
-    for v in known_vendors:
-        if v in clean_name:
-            vendor = v
-            break
+    # Substring match: filenames often glue vendor and model together
+    vendor, vendor_key = vendor_catalog(known_vendors).match(clean_name, whole_words=False)
 
     # Model = everything except vendor
     if vendor:
-        model_candidate = clean_name.replace(vendor, "").strip()
+        model_candidate = clean_name.replace(vendor_key, "").strip()
         model = model_candidate if model_candidate else None
     else:
         return None, None
@@ -144,7 +111,7 @@ def detect_vendor_from_filename(pdf_path, pages_data, known_vendors):
     # VALIDATION STEP
     # -----------------------------
     # Accept only if vendor or model appears in first page
-    if vendor in first_page_text:
+    if vendor_key in first_page_text:
         return vendor, model
 
     if model and model in first_page_text:
@@ -158,13 +125,9 @@ def detect_vendor_from_text(pages_data, known_vendors):
     if not pages_data:
         return None
 
-    first_page_text = pages_data[0].get("page_text", "").upper()
+    vendor, _ = vendor_catalog(known_vendors).match(pages_data[0].get("page_text", ""))
 
-    for vendor in known_vendors:
-        if vendor in first_page_text:
-            return vendor
-
-    return None
+    return vendor
 
 def detect_model_from_text(pages_data):
 
@@ -175,46 +138,30 @@ def detect_model_from_text(pages_data):
     if not text:
         return None
 
-    keywords = [
-        "MODEL",
-        "SERIES",
-        "PROJECT",
-        "TYPE",
-        "CODE",
-        "P/N",
-        "PN",
-        "PART NO",
-        "MODEL NO"
-    ]
+    for line in text.splitlines():
+        line = line.strip()
 
-    lines = text.splitlines()
-
-    for line in lines:
-        line_upper = line.strip().upper()
-
-        for kw in keywords:
-            if line_upper.startswith(kw):
+        match = MODEL_LINE_REGEX.match(line)
+        if not match:
+            continue
 
-                # Remove keyword + optional ":" or "-"
-                value = re.sub(
-                    rf"^{kw}\s*[:\-]?\s*",
-                    "",
-                    line.strip(),
-                    flags=re.IGNORECASE
-                )
+        # Remove keyword + optional ":" or "-"
+        value = line[match.end():]
 
-                if value:
-                    return value.strip()
+        if value:
+            return value.strip()
 
     return None
 
 def detect_vendor(pdf_path, pages_data, known_vendors):
 
+    known_vendors = vendor_catalog(known_vendors)
+
     # 1️⃣ Try filename first
     vendor, model = detect_vendor_from_filename(
     pdf_path,
     pages_data,
-    KNOWN_VENDORS
+    known_vendors
 )
 
     if not vendor:
@@ -245,7 +192,7 @@ def _first_pn_top(words, debug=False):
 
     return first_top
 # ==================================================
-# EXPORT WITH SUMMARY (UNCHANGED)
+# EXPORT WITH SUMMARY (XLSX PARTS WRITER)
 # ==================================================
 def export_with_summary(all_parts,
     pages_data,
@@ -255,105 +202,501 @@ def export_with_summary(all_parts,
     project=None,
     subproject=None,
     equipment=None,
-    pdf_path=None):
-    
-    wb = Workbook()
-    vendor = vendor or "N/A"
-    model = model or "N/A"
-    project = project or "N/A"
-    subproject = subproject or "N/A"
-    equipment = equipment or "N/A"
-
-    filename = "N/A"
-    if pdf_path:
-        import os
-        filename = os.path.basename(pdf_path)
-
-    # -------------------------------
-    # SHEET 1: PARTS
-    # -------------------------------
-    ws_parts = wb.active
-    ws_parts.title = "Parts"
-
-    ws_parts.append([
-        "Vendor",
-        "Model",
-        "DESCRIPTION",
-        "Title_EQUIPMENT_PROJECT",
-        "Drawing",
-        "No Item-(Mnl)",
-        "pageno_FILENAME",
-        "project",
-        "Sub Project No-(Mnl)",
-        "Equipment Name-(Mnl)"
-    ])
-    for p in all_parts:
-        ws_parts.append([
-            vendor,
-            model,
-            p["description"],
-            p.get("title", ""),
-            p.get("drawing_number", ""),
-            p["part_no"],
-            f'{p["page"]}_{filename}',
-            project,
-            subproject,
-            equipment
-        ])
-
-    # -------------------------------
-    # SHEET 2: SUMMARY
-    # -------------------------------
-    ws_summary = wb.create_sheet("Summary")
-
-    pages_scanned = len(pages_data)
-    total_parts = len(all_parts)
-
-    parts_per_page = defaultdict(int)
-    pn_counts = Counter()
-    pn_pages = defaultdict(set)
-
-    for p in all_parts:
-        parts_per_page[p["page"]] += 1
-        pn_counts[p["part_no"]] += 1
-        pn_pages[p["part_no"]].add(p["page"])
-
-    duplicate_pns = {
-        pn: {
-            "count": cnt,
-            "pages": sorted(pn_pages[pn])
-        }
-        for pn, cnt in pn_counts.items()
-        if cnt > 1
+    pdf_path=None,
+    pages_scanned=None):
+
+    if pages_scanned is None:
+        pages_scanned = len(pages_data)
+
+    writer = XlsxPartsWriter(
+        output_xlsx,
+        vendor=vendor,
+        model=model,
+        project=project,
+        subproject=subproject,
+        equipment=equipment,
+        pdf_path=pdf_path
+    )
+    writer.write(all_parts)
+
+    return writer.close(pages_scanned)
+
+
+# ==================================================
+# PER-PAGE TABLE DISPATCH
+# ==================================================
+def extract_page_parts(page_data, debug=False, stats=NULL_STATS):
+    """
+    Classify a single page candidate and run the matching extractor.
+    Returns the extracted parts (titles are assigned separately).
+
+    The table type is picked by classify_page from the TABLE_TYPES
+    registry (multitable_inline/table_types.py), in priority order.
+
+    stats (PipelineStats) receives stage timings and a per-page record.
+
+    Parts only carry a "trace" (overlay boxes) with debug.
+    """
+
+    parts = classify_and_extract(page_data, debug=debug, stats=stats)[1]
+    finalize_traces(parts, debug=debug)
+
+    return parts
+
+
+def classify_and_extract(page_data, debug=False, stats=NULL_STATS):
+    """extract_page_parts, also returning the table mode: (name, parts)."""
+
+    page_no = page_data["page"]
+    t0 = time.perf_counter() if stats.enabled else None
+
+    # normalize_table runs at most once per variant for this page
+    geometry = PageGeometry(page_data, stats=stats)
+
+    with stats.stage("classify"):
+        table_type = classify_page(page_data, geometry, debug=debug, stats=stats)
+
+    name = table_type.name if table_type else "INLINE"
+
+    # -------------------------------------------------
+    # INLINE EXTRACTION (ONLY IF NOT TABLE)
+    # -------------------------------------------------
+    if table_type is None:
+        with stats.stage("extract.INLINE"):
+            parts = extract_inline_pns(
+                page_data,
+                debug=debug
+            )
+
+    else:
+        if debug:
+            print(f"[PIPELINE] Page {page_no} | {table_type.name} TABLE MODE")
+
+        normalized = geometry.normalized(debug=debug)
+
+        if not normalized.get("rows"):
+            parts = []
+        else:
+            with stats.stage(f"extract.{name}"):
+                parts = table_type.extractor(
+                    normalized,
+                    debug=debug
+                )
+
+    if stats.enabled:
+        words = len(page_data.get("words", []))
+
+        stats.count("pages")
+        stats.count("words", words)
+        stats.count("parts", len(parts))
+        stats.count(f"table_type.{name}")
+
+        stats.page(
+            page=page_no,
+            words=words,
+            rows=geometry.row_count(),
+            table_type=name,
+            parts=len(parts),
+            seconds=round(time.perf_counter() - t0, 6)
+        )
+
+    return name, parts
+
+
+# ==================================================
+# PAGE TITLE ASSIGNMENT
+# ==================================================
+def assign_page_title(extracted_parts, words, prev_words=None, page_no=None, debug=False):
+    """
+    Resolve the title for one page's parts and apply it in place.
+
+    prev_words are the words of the previous page candidate, used only
+    for the previous-page fallback.
+    """
+
+    title = None
+    title_words = []
+
+    # 1️⃣ Prefer table structural title
+    if extracted_parts and extracted_parts[0].get("title"):
+        title = extracted_parts[0]["title"]
+
+        # structural titles already carry title_boxes via extractor
+        # so we don't need to re-detect words here
+
+    # 2️⃣ Page-level title detection
+    if not title:
+        # --------------------------------------------------
+        # ANCHOR: derive from extracted parts (preferred)
+        # --------------------------------------------------
+
+        pn_top = None
+
+        if extracted_parts:
+            for p in extracted_parts:
+                trace = p.get("trace")
+                if trace and trace.get("pn_boxes"):
+                    pn_top = min(box["top"] for box in trace["pn_boxes"])
+                    if debug:
+                        print(f"[PN-ANCHOR-FROM-TRACE] top={pn_top}")
+                    break
+
+        # Fallback only if no trace anchor found
+        if pn_top is None:
+            pn_top = _first_pn_top(words, debug=debug)
+
+        # Now run page title detection
+        if pn_top is not None:
+            result = extract_page_title(words, pn_top)
+
+            if result:
+                title, title_words = result
+
+                # Capture actual words that form this title (overlay only)
+                if debug:
+                    title_words = [
+                        w for w in words
+                        if w["text"] in title.split()
+                        and w["top"] < pn_top
+                    ]
+
+    # 3️⃣ Previous-page fallback
+    if not title and prev_words:
+        detected_title = extract_prev_page_title(prev_words)
+
+        if detected_title:
+            title = detected_title
+
+    # Apply title to all parts
+    for p in extracted_parts:
+        p["title"] = title or ""
+
+        # 🔴 Inject title boxes into trace for overlay
+        if debug and title_words:
+            if "trace" not in p:
+                p["trace"] = {}
+
+            p["trace"]["title_boxes"] = title_words
+
+    if debug:
+        print(
+            f"[TITLE] Page {page_no} | "
+            f"{title if title else 'NONE'}"
+        )
+
+
+# ==================================================
+# PAGE SHARD PROCESSING (SERIAL + PROCESS POOL)
+# ==================================================
+class PipelineCancelled(Exception):
+    """Raised by run() when its cancel token is set between pages."""
+
+
+def _check_cancel(cancel):
+    if cancel is not None and cancel.is_set():
+        raise PipelineCancelled("Extraction cancelled")
+
+
+def _process_page_shard(
+    pdf_path,
+    page_numbers=None,
+    pages=None,
+    debug=False,
+    word_cache=None,
+    pdf_hash=None,
+    engine=None,
+    collect_stats=False,
+    on_page=None,
+    cancel=None
+):
+    """
+    Run step 1 through the per-page extractors over a range of pages.
+
+    This is the unit of work for both serial and parallel runs; each
+    call opens its own PDF handle. The result is compact: the
+    first page's text (vendor detection), the parts of every processed
+    page, and the previous-page title of the shard's last page so the
+    next shard's first page can resolve its title fallback.
+
+    With collect_stats, the shard also carries a PipelineStats report.
+    on_page(table_mode, parts) is called as each page is processed
+    (on_page(None, []) for selected pages skipped as blank or
+    unreadable), and the cancel token is checked before each page
+    (serial runs only; neither crosses process boundaries).
+    """
+
+    stats = PipelineStats() if collect_stats else NULL_STATS
+
+    shard = {
+        "head": None,
+        "pages": [],
+        "tail_title": None,
+        "has_pages": False,
+        "skipped": 0,
     }
 
-    ws_summary.append(["Metric", "Value"])
-    ws_summary.append(["Pages scanned", pages_scanned])
-    ws_summary.append(["Total parts extracted", total_parts])
-    ws_summary.append(["Pages with parts", len(parts_per_page)])
-    ws_summary.append(["Pages without parts", pages_scanned - len(parts_per_page)])
-    ws_summary.append(["Duplicate part numbers", len(duplicate_pns)])
+    # Words of the closest earlier page that has words (title fallback);
+    # only known from inside the current run of consecutive pages read
+    prev_words = None
+    run_start = None
+    last_seen = None
+
+    def see(page_no):
+        nonlocal prev_words, run_start, last_seen
+
+        # Pages in a gap were not read: the previous page is unknown
+        if last_seen is None or page_no != last_seen + 1:
+            prev_words = None
+            run_start = page_no
+
+        last_seen = page_no
+
+    def on_skip(page_no):
+        see(page_no)
+
+        # Skipped pages still count toward the progress total
+        if pages and page_no not in pages:
+            return
+
+        shard["skipped"] += 1
+
+        if on_page is not None:
+            on_page(None, [])
+
+    page_iter = iter_page_candidates(
+        pdf_path,
+        page_numbers=page_numbers,
+        word_cache=word_cache,
+        pdf_hash=pdf_hash,
+        engine=engine,
+        on_skip=on_skip
+    )
+
+    while True:
+
+        _check_cancel(cancel)
+
+        # Step 1 (word extraction) runs inside the generator
+        with stats.stage("step1.words"):
+            page_data = next(page_iter, None)
+
+        if page_data is None:
+            break
+
+        page_no = page_data["page"]
+        words = page_data.get("words", [])
+
+        see(page_no)
+
+        if shard["head"] is None:
+            shard["head"] = {
+                "page": page_no,
+                "page_text": page_data.get("page_text", "")
+            }
+
+        if pages and page_no not in pages:
+            prev_words = words
+            continue
+
+        table_mode, extracted_parts = classify_and_extract(page_data, debug=debug, stats=stats)
+        title_pending = False
+
+        if extracted_parts:
+            context_words = prev_words
+
+            # A page selection only reads the page before each selected
+            # one; when that is blank, walk back to the closest page with
+            # words, as a full run would
+            if context_words is None and pages and run_start > 1:
+                with stats.stage("step1.words"):
+                    before = nearest_page_before(
+                        pdf_path,
+                        run_start,
+                        word_cache=word_cache,
+                        pdf_hash=pdf_hash,
+                        engine=engine
+                    )
+                context_words = before["words"] if before else None
+
+            with stats.stage("title"):
+                assign_page_title(
+                    extracted_parts,
+                    words,
+                    prev_words=context_words,
+                    page_no=page_no,
+                    debug=debug
+                )
+
+            # Traces reference this page's words; keep plain boxes or nothing
+            finalize_traces(extracted_parts, debug=debug)
+
+            # Previous page lives in another shard → resolved on merge
+            # (whole-document runs only; shards then cover every page)
+            title_pending = not pages and prev_words is None and not extracted_parts[0]["title"]
+
+        shard["pages"].append((page_no, extracted_parts, title_pending, table_mode))
+
+        if on_page is not None:
+            on_page(table_mode, extracted_parts)
+
+        # Only the previous page's words are kept, for the title fallback
+        prev_words = words
+
+    if prev_words is not None:
+        shard["has_pages"] = True
+        with stats.stage("title"):
+            shard["tail_title"] = extract_prev_page_title(prev_words)
+
+    if stats.enabled:
+        shard["stats"] = stats.report()
+
+    return shard
+
+
+def _shard_page_numbers(pdf_path, pages, workers):
+    """
+    Split the pages step 1 must read into contiguous shards, several
+    per worker so one dense range doesn't leave the others idle.
+    """
+
+    needed = pages_to_extract(pages)
+
+    if needed is None:
+        page_numbers = list(range(1, count_pages(pdf_path) + 1))
+    else:
+        page_numbers = sorted(needed)
+
+    n_shards = max(1, workers * 4)
+    size = max(1, -(-len(page_numbers) // n_shards))
+
+    return [
+        page_numbers[i:i + size]
+        for i in range(0, len(page_numbers), size)
+    ]
+
+
+def _run_page_shards(
+    pdf_path,
+    pages,
+    workers,
+    debug=False,
+    word_cache=None,
+    pdf_hash=None,
+    engine=None,
+    collect_stats=False,
+    on_page=None,
+    cancel=None
+):
+    """
+    Yields shard results in page order. on_page(table_mode, parts) is
+    called per processed page: as it happens in a serial run, and as
+    each shard comes back from the pool in a parallel one.
+
+    The cancel token is checked before every page in a serial run and
+    between shards in a parallel one; shards not yet started are then
+    dropped.
+    """
+
+    if not workers or workers <= 1:
+        yield _process_page_shard(
+            pdf_path,
+            pages_to_extract(pages),
+            pages,
+            debug,
+            word_cache,
+            pdf_hash,
+            engine,
+            collect_stats,
+            on_page,
+            cancel
+        )
+        return
+
+    shards = _shard_page_numbers(pdf_path, pages, workers)
+
+    if debug:
+        print(f"[PIPELINE] {len(shards)} page shards across {workers} workers")
+
+    # Shard results are yielded in page order as they complete
+    pool = ProcessPoolExecutor(max_workers=workers)
+
+    try:
+        for shard in pool.map(
+            _process_page_shard,
+            itertools.repeat(pdf_path),
+            shards,
+            itertools.repeat(pages),
+            itertools.repeat(debug),
+            itertools.repeat(word_cache),
+            itertools.repeat(pdf_hash),
+            itertools.repeat(engine),
+            itertools.repeat(collect_stats)
+        ):
+            _check_cancel(cancel)
+
+            if on_page is not None:
+                for _, extracted_parts, _, table_mode in shard["pages"]:
+                    on_page(table_mode, extracted_parts)
+
+                for _ in range(shard["skipped"]):
+                    on_page(None, [])
+
+            yield shard
+
+    finally:
+        # On cancel (or any error) queued shards are not started
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def detect_vendor_model(pdf_path, head, vendor=None, model=None):
+    """
+    Fill in vendor/model (when not given) from the document's first
+    page (the shard "head").
+    """
+
+    # Vendor/model detection only needs the first page's text
+    first_pages = [head] if head else []
+
+    # One detection pass fills in whichever of the two is missing
+    if not vendor or not model:
+        found_vendor, found_model = detect_vendor(pdf_path, first_pages, KNOWN_VENDORS)
+        vendor = vendor or found_vendor
+        model = model or found_model
+
+    return vendor, model
+
 
-    ws_summary.append([])
-    ws_summary.append(["Parts per page"])
-    ws_summary.append(["Page", "Count"])
+def _iter_merged_pages(shards, stats=NULL_STATS):
+    """
+    Merge shard results in page order and apply the cross-shard
+    previous-page title fallback.
+
+    Yields (head, extracted_parts) per processed page; head is the
+    document's first page (vendor detection). Shard stats reports are
+    merged into stats.
+    """
+
+    head = None
+    prev_tail_title = None
+
+    for shard in shards:
 
-    for page in sorted(parts_per_page):
-        ws_summary.append([page, parts_per_page[page]])
+        if head is None:
+            head = shard["head"]
 
-    ws_summary.append([])
-    ws_summary.append(["Duplicate Part Numbers"])
-    ws_summary.append(["Part No", "Occurrences", "Pages"])
+        if stats.enabled and shard.get("stats"):
+            stats.merge(shard["stats"])
 
-    for pn, info in duplicate_pns.items():
-        ws_summary.append([
-            pn,
-            info["count"],
-            ", ".join(map(str, info["pages"]))
-        ])
+        for page_no, extracted_parts, title_pending, _ in shard["pages"]:
 
-    wb.save(output_xlsx)
-    return output_xlsx
+            if title_pending and prev_tail_title:
+                for p in extracted_parts:
+                    p["title"] = prev_tail_title
+
+            yield head, extracted_parts
+
+        if shard["has_pages"]:
+            prev_tail_title = shard["tail_title"]
 
 
 # ==================================================
@@ -368,446 +711,244 @@ def run(
     subproject=None,
     equipment=None,
     debug=False,
-    pages=None
+    pages=None,
+    workers=None,
+    cache=None,
+    word_cache=None,
+    engine=None,
+    output_formats=("xlsx",),
+    stats=None,
+    stats_sheet=False,
+    progress=None,
+    cancel=None
 ):
-    all_parts = []
+    """
+    workers: number of processes for page extraction. None/1 runs in
+    this process; more shards the document across a process pool and
+    produces the same output.
+
+    cache: optional ResultCache. On a hit (same PDF content, pipeline
+    version and page selection) steps 1-4 are skipped and only the
+    workbook is regenerated.
+
+    word_cache: optional WordCache. Page words are loaded from it
+    instead of parsing the PDF; missing pages are parsed and stored.
+
+    engine: step 1 word-extraction backend, "pdfplumber" (default) or
+    "pymupdf" (much faster; word boxes may differ slightly).
+
+    output_formats: any of "xlsx", "csv", "parquet", "ndjson". Each
+    is written next to output_csv with its own extension; the record
+    formats carry the Parts sheet columns. Returns the path of the
+    first format.
+
+    stats: optional PipelineStats, filled with per-stage wall time and
+    call counts, counters and per-page records (worker stages are
+    summed over processes). The report is also written to
+    <output>_stats.json, and with stats_sheet to a "Stats" sheet.
+
+    progress: optional callable, called after every processed page as
+    progress(pages_done, total_pages, parts_so_far, table_mode), where
+    table_mode is the page's table type name or "INLINE" (None on a
+    result cache hit, reported once as complete).
+
+    cancel: optional token with is_set() (threading.Event,
+    multiprocessing.Event, ...), checked between pages. Once set, run()
+    stops, removes the partial outputs and raises PipelineCancelled.
+    """
+
+    run_started = time.perf_counter()
+    stats = stats if stats is not None else NULL_STATS
+
+    if pages:
+        pages = set(pages)
+
+    engine = engine or DEFAULT_ENGINE
+    get_engine(engine)
+
+    output_formats = resolve_formats(output_formats)
+
+    # One content hash for both caches
+    pdf_hash = None
+
+    if cache is not None or word_cache is not None:
+        with stats.stage("hash"):
+            pdf_hash = file_sha256(pdf_path)
 
     # ----------------------------------------------
-    # STEP 1 — Extract words from ALL pages
+    # RESULT CACHE LOOKUP
     # ----------------------------------------------
-    pages_data = extract_table_candidates(pdf_path)
-    if not vendor:
-        vendor, b= detect_vendor(pdf_path, pages_data, KNOWN_VENDORS)
-    if not model:
-        a,model = detect_vendor(pdf_path, pages_data, KNOWN_VENDORS)
-
+    cache_key = None
+    cached = None
+
+    if cache is not None:
+        cache_key = cache.key(
+            pdf_path,
+            PIPELINE_VERSION,
+            pages=pages,
+            debug=debug,
+            pdf_hash=pdf_hash,
+            engine=engine
+        )
+        with stats.stage("cache.get"):
+            cached = cache.get(cache_key)
 
-    if debug:
-        print(f"[PIPELINE] Total pages scanned: {len(pages_data)}")
+    # ----------------------------------------------
+    # EXPORT — rows are streamed to every requested
+    # output format as pages complete
+    # ----------------------------------------------
+    writers = None
+
+    def open_output(head):
+        nonlocal vendor, model
+
+        with stats.stage("vendor_detection"):
+            vendor, model = detect_vendor_model(pdf_path, head, vendor, model)
+
+        return open_writers(
+            output_csv,
+            output_formats,
+            vendor=vendor,
+            model=model,
+            project=project,
+            subproject=subproject,
+            equipment=equipment,
+            pdf_path=pdf_path
+        )
 
     # ----------------------------------------------
-    # MAIN LOOP
+    # PROGRESS REPORTING
     # ----------------------------------------------
-    for i, page_data in enumerate(pages_data):
-    
-        page_no = page_data["page"]
-    
-        if pages and page_no not in pages:
-            continue
-    
-        words = page_data.get("words", [])
-        page_text_lower = page_data.get("page_text", "").lower()
-    
-        extracted_parts = []
-        normalized = None
-    
-        import re
-    
-        # =====================================================
-        # ⭐ 1️⃣ FORCE MARK TABLE (HIGHEST PRIORITY)
-        # =====================================================
-        if (
-            re.search(r"\bmark\b", page_text_lower)
-            and re.search(r"\bdwg\b", page_text_lower)
-            and re.search(r"\bdescription\b", page_text_lower)
-        ):
-            if debug:
-                print(f"[PIPELINE] Page {page_no} | FORCED MARK TABLE MODE")
-    
-            normalized = normalize_table(page_data, debug=debug)
-    
-            if normalized and normalized.get("rows"):
-                extracted_parts = extract_mark_table(
-                    normalized,
-                    debug=debug
-                )
-    
-        # =====================================================
-        # ⭐ 2️⃣ POS-ITEM TABLE (BEFORE STEP2)
-        # =====================================================
-        elif any(
-            (
-                "pos" in row_text
-                and "qty" in row_text
-                and "item name" in row_text
-                and "item no" in row_text
-                and "drawing reference" in row_text
-            )
-            for row_text in [
-                " ".join(w["text"].lower() for w in row["words"])
-                for row in normalize_table(page_data)["rows"][:15]
-            ]
-        ):
-            if debug:
-                print(f"[PIPELINE] Page {page_no} | POS-ITEM TABLE MODE")
-    
-            normalized = normalize_table(page_data, debug=debug)
-    
-            if normalized and normalized.get("rows"):
-                extracted_parts = extract_pos_item_table(
-                    normalized,
-                    debug=debug
-                )
-    
-        # =====================================================
-        # ⭐ 3️⃣ SIMPLE 3-COLUMN TABLE (INDEPENDENT)
-        # =====================================================
-        elif (
-            "qty" in page_text_lower
-            and "part number" in page_text_lower
-            and "description" in page_text_lower
-        ):
+    on_page = None
+
+    if progress is not None:
+        n_pages = count_pages(pdf_path)
+        total_pages = n_pages if not pages else sum(1 for p in pages if 1 <= p <= n_pages)
+        done = {"pages": 0, "parts": 0}
+
+        def on_page(table_mode, extracted_parts):
+            done["pages"] += 1
+            done["parts"] += len(extracted_parts)
+            progress(done["pages"], total_pages, done["parts"], table_mode)
+
+    # Parts are only kept in memory when something needs them
+    # after export (result cache, debug overlay)
+    keep_parts = cache is not None or debug
+    all_parts = []
+
+    # Cancelled or failed runs leave no partial output behind
+    try:
+        if cached:
             if debug:
-                print(f"[PIPELINE] Page {page_no} | TRY SIMPLE 3COL MODE")
-    
-            normalized = normalize_table(page_data, debug=debug)
-    
-            if normalized and normalized.get("rows"):
-                simple_parts = extract_simple_3col_table(
-                    normalized,
-                    debug=debug
-                )
-    
-                if simple_parts:
-                    extracted_parts = simple_parts
-    
-        # =====================================================
-        # ⭐ 4️⃣ GENERIC TABLE HANDLING (STEP2)
-        # =====================================================
+                print(f"[PIPELINE] Result cache hit {cache_key[:12]}")
+
+            all_parts = cached["parts"]
+            pages_scanned = cached["pages_scanned"]
+            head = cached["head"]
+
+            writers = open_output(head)
+
+            with stats.stage("export.write"):
+                for writer in writers:
+                    writer.write(all_parts)
+
+            if progress is not None:
+                progress(pages_scanned, pages_scanned, len(all_parts), None)
+
         else:
-    
-            table_type = is_parts_table(page_data, debug=debug)
-    
-            if table_type:
-    
-                normalized = normalize_table(page_data, debug=debug)
-    
-                # ---------- COMPONENT LIST ----------
-                if (
-                    normalized
-                    and any(
-                        {
-                            "Level",
-                            "Material",
-                            "Disc.",
-                            "BOM",
-                            "item",
-                            "Description",
-                            "Remarks"
-                        }.issubset({w["text"] for w in row["words"]})
-                        for row in normalized["rows"][:12]
-                    )
-                ):
-                    if debug:
-                        print(f"[PIPELINE] Page {page_no} | COMPONENT LIST MODE")
-    
-                    extracted_parts = extract_component_list_table(
-                        normalized,
-                        debug=debug
-                    )
-    
-                # ---------- ALT-ID TABLE ----------
-                elif table_type == "ALT_ID_TABLE":
-    
-                    if normalized and normalized.get("rows"):
-                        extracted_parts = extract_alt_id_parts(
-                            normalized,
-                            debug=debug
-                        )
-    
-                # ---------- SIMPLE 2COL ----------
-                elif table_type == "SIMPLE_2COL_TABLE":
-    
-                    if normalized and normalized.get("rows"):
-                        extracted_parts = extract_simple_2col_table(
-                            normalized,
-                            debug=debug
-                        )
-                        
-                # ---------- POS DRAWING TABLE ----------
-                elif any(
-                    "item name/technical" in " ".join(w["text"].lower() for w in row["words"])
-                    for row in normalized["rows"][:12]
-                ):
-                    if debug:
-                        print(f"[PIPELINE] Page {page_no} | POS-DRAW TABLE MODE")
-                
-                    extracted_parts = extract_pos_drawing_table(
-                        normalized,
-                        debug=debug
-                    )
+            # ----------------------------------------------
+            # STEP 1-4 — Stream pages through extraction
+            # ----------------------------------------------
+            # With a page selection, step 1 only parses the pages the
+            # selection needs (see pages_to_extract).
+            shards = _run_page_shards(
+                pdf_path,
+                pages,
+                workers,
+                debug=debug,
+                word_cache=word_cache,
+                pdf_hash=pdf_hash,
+                engine=engine,
+                collect_stats=stats.enabled,
+                on_page=on_page,
+                cancel=cancel
+            )
 
-                # ---------- ARTICLE NUMBER TABLE ----------
-                elif any(
-                    (
-                        "article" in row_text
-                        and "number" in row_text
-                        and "description" in row_text
-                        and "certificate" in row_text
-                    )
-                    for row_text in [
-                        " ".join(w["text"].lower().replace(".", "") for w in row["words"])
-                        for row in normalized["rows"][:15]
-                    ]
-                ):
-                    if debug:
-                        print(f"[PIPELINE] Page {page_no} | ARTICLE-NUMBER TABLE MODE")
-                
-                    extracted_parts = extract_article_number_table(
-                        normalized,
-                        debug=debug
-                    )
-                # ⭐ SINGLE LEVEL BOM MODE
-                # ⭐ SINGLE LEVEL BOM MODE
-                elif any(
-                    {"no.", "item", "rev", "description"}.issubset(
-                        {w["text"].lower().strip() for w in row["words"]}
-                    )
-                    for row in normalize_table(page_data)["rows"][:12]
-                ):
-                    if debug:
-                        print(f"[PIPELINE] Page {page_no} | SINGLE LEVEL BOM MODE")
-                
-                    normalized = normalize_table(page_data, debug=debug)
-                
-                    if normalized and normalized.get("rows"):
-                        extracted_parts = extract_single_level_bom(
-                            normalized,
-                            debug=debug
-                        )
-                
-                # ⭐ SPLIT HEADER ITEM/PART TABLE
-                elif (
-                    lambda normalized: any(
-                        (
-                            {"item", "part"}.issubset(
-                                {w["text"].lower() for w in normalized["rows"][i]["words"]}
-                            )
-                            and
-                            "number" in {w["text"].lower() for w in normalized["rows"][i + 1]["words"]}
-                            and
-                            "qty." in {w["text"].lower() for w in normalized["rows"][i + 1]["words"]}
-                            and
-                            "description" in {w["text"].lower() for w in normalized["rows"][i + 1]["words"]}
-                        )
-                        for i in range(len(normalized["rows"]) - 1)
-                    )
-                )(
-                    normalize_table(page_data)
-                ):
-                    if debug:
-                        print(f"[PIPELINE] Page {page_no} | SPLIT HEADER TABLE MODE")
-                
-                    normalized = normalize_table(page_data, debug=debug)
-                
-                    extracted_parts = extract_split_header_item_part_table(
-                        normalized,
-                        debug=debug
-                    )
+            pages_scanned = 0
+            head = None
 
-                # ---------- BALLOON BOM TABLE ----------
-                elif any(
-                    (
-                        "balloon" in row1_text
-                        and "part" in row1_text
-                        and "number" in row2_text
-                        and "rev" in row2_text
-                        and "description" in row2_text
-                    )
-                    for row1_text, row2_text in [
-                        (
-                            " ".join(w["text"].lower() for w in normalized["rows"][i]["words"]),
-                            " ".join(w["text"].lower() for w in normalized["rows"][i + 1]["words"])
-                        )
-                        for i in range(len(normalized["rows"]) - 1)
-                    ]
-                ):
-                    if debug:
-                        print(f"[PIPELINE] Page {page_no} | BALLOON BOM TABLE MODE")
-                
-                    extracted_parts = extract_balloon_bom_table(
-                        normalized,
-                        debug=debug
-                    )
+            try:
+                for head, extracted_parts in _iter_merged_pages(shards, stats=stats):
 
-                elif any(
-                    [
-                        [w["text"] for w in row["words"]] ==
-                        ['Parts', 'List', 'Item', 'Qty', 'Description', 'PMH', 'Part', 'No']
-                        for row in normalized["rows"][:12]
-                    ]
-                ):
-                    if debug:
-                        print(f"[PIPELINE] Page {page_no} | RECOMMENDED SPARES MODE")
-                
-                    extracted_parts = extract_recommended_spares_table(
-                        normalized,
-                        debug=debug
-                    )
+                    if writers is None:
+                        writers = open_output(head)
 
-                # ⭐ PMH / MOS TABLE MODE
-                elif any(
-                    (
-                        "item" in row_text
-                        and "qty" in row_text
-                        and "description" in row_text
-                        and ("pmh part no" in row_text or "mos part no" in row_text)
-                    )
-                    for row_text in [
-                        " ".join(w["text"].lower() for w in row["words"])
-                        for row in normalize_table(page_data)["rows"][:8]
-                    ]
-                ):
-                    if debug:
-                        print(f"[PIPELINE] Page {page_no} | PMH/MOS TABLE MODE")
-                
-                    normalized = normalize_table(page_data, debug=debug)
-                
-                    extracted_parts = extract_pmh_mos_table(
-                        normalized,
-                        debug=debug
-                    )
+                    with stats.stage("export.write"):
+                        for writer in writers:
+                            writer.write(extracted_parts)
+                    pages_scanned += 1
 
+                    if keep_parts:
+                        all_parts.extend(extracted_parts)
 
-                # ---------- NORMAL TABLE ----------
-                else:
-    
-                    if normalized and normalized.get("rows"):
-                        extracted_parts = extract_parts(
-                            normalized,
-                            debug=debug
-                        )
-    
-            # -------------------------------------------------
-            # INLINE EXTRACTION (ONLY IF NOT TABLE)
-            # -------------------------------------------------
-            else:
-                extracted_parts = extract_inline_pns(
-                    page_data,
-                    debug=debug
-                )
+            except PipelineCancelled:
+                if debug:
+                    print(f"[PIPELINE] Cancelled after {pages_scanned} pages")
+
+                raise
+
+            finally:
+                # Stops the worker pool when the loop ends early
+                shards.close()
+
+            if writers is None:
+                writers = open_output(head)
+
+            if cache is not None:
+                with stats.stage("cache.put"):
+                    cache.put(cache_key, {
+                        "parts": all_parts,
+                        "pages_scanned": pages_scanned,
+                        "head": head,
+                    })
+
+        # The sheet must be added before the workbook is saved, so it
+        # doesn't include export.close and the run total
+        if stats.enabled and stats_sheet:
+            for writer in writers:
+                if isinstance(writer, XlsxPartsWriter):
+                    writer.add_sheet("Stats", report_rows(stats.report()))
+
+        with stats.stage("export.close"):
+            outputs = [writer.close(pages_scanned) for writer in writers]
+
+    except BaseException:
+        for writer in writers or []:
+            writer.abort()
+
+        raise
+
+    if stats.enabled:
+        stats.add_time("total", time.perf_counter() - run_started)
+
+        stats_json = os.path.splitext(output_csv)[0] + "_stats.json"
+        stats.write_json(stats_json)
 
-        # =====================================================
-        # TITLE EXTRACTION (UPDATED PRIORITY)
-        # =====================================================
-        # =====================================================
-        # TITLE EXTRACTION (WITH DEBUG TRACE SUPPORT)
-        # =====================================================
-        
-        if not extracted_parts:
-            continue
-        
-        title = None
-        title_words = []
-        
-        # 1️⃣ Prefer table structural title
-        if extracted_parts and extracted_parts[0].get("title"):
-            title = extracted_parts[0]["title"]
-        
-            # structural titles already carry title_boxes via extractor
-            # so we don't need to re-detect words here
-        
-        # 2️⃣ Page-level title detection
-        if not title:
-            # --------------------------------------------------
-            # ANCHOR: derive from extracted parts (preferred)
-            # --------------------------------------------------
-            
-            pn_top = None
-            
-            if extracted_parts:
-                for p in extracted_parts:
-                    trace = p.get("trace")
-                    if trace and trace.get("pn_boxes"):
-                        pn_top = min(box["top"] for box in trace["pn_boxes"])
-                        if debug:
-                            print(f"[PN-ANCHOR-FROM-TRACE] top={pn_top}")
-                        break
-            
-            # Fallback only if no trace anchor found
-            if pn_top is None:
-                pn_top = _first_pn_top(words, debug=debug)
-            
-            # Now run page title detection
-            if pn_top is not None:
-                result = extract_page_title(words, pn_top)
-
-                if result:
-                    title, title_words = result
-        
-                    # Capture actual words that form this title
-                    title_words = [
-                        w for w in words
-                        if w["text"] in title.split()
-                        and w["top"] < pn_top
-                    ]
-        
-        # 3️⃣ Previous-page fallback
-        if not title and i > 0:
-            prev_words = pages_data[i - 1].get("words", [])
-            detected_title = extract_prev_page_title(prev_words)
-        
-            if detected_title:
-                title = detected_title
-        
-        # Apply title to all parts
-        for p in extracted_parts:
-            p["title"] = title or ""
-        
-            # 🔴 Inject title boxes into trace for overlay
-            if debug and title_words:
-                if "trace" not in p:
-                    p["trace"] = {}
-        
-                p["trace"]["title_boxes"] = [
-                    {
-                        "text": w["text"],
-                        "x0": w["x0"],
-                        "x1": w["x1"],
-                        "top": w["top"],
-                        "bottom": w["bottom"],
-                    }
-                    for w in title_words
-                ]
-        
         if debug:
-            print(
-                f"[TITLE] Page {page_no} | "
-                f"{title if title else 'NONE'}"
-            )
+            print(f"[PIPELINE] Stats report written to {stats_json}")
 
-        all_parts.extend(extracted_parts)
-    
     # =====================================================
     # FINAL DEBUG
     # =====================================================
     if debug:
-        print(f"[PIPELINE] Total parts extracted: {len(all_parts)}")
-
-
-    # ----------------------------------------------
-    # EXPORT XLSX (UNCHANGED)
-    # ----------------------------------------------
-    output_xlsx = output_csv.replace(".csv", ".xlsx")
-
-    export_with_summary(
-    all_parts=all_parts,
-    pages_data=pages_data,
-    output_xlsx=output_xlsx,
-    vendor=vendor,
-    model=model,
-    project=project,
-    subproject=subproject,
-    equipment=equipment,
-    pdf_path=pdf_path
-)
+        print(f"[PIPELINE] Total pages scanned: {pages_scanned}")
+        print(f"[PIPELINE] Total parts extracted: {writers[0].total_parts}")
 
     # ----------------------------------------------
     # DEBUG OVERLAY PDF (UNCHANGED)
     # ----------------------------------------------
     if debug:
         from multitable_inline.debug_overlay import generate_debug_pdf
-        import os
 
         base, ext = os.path.splitext(pdf_path)
         debug_pdf = base + "_debug.pdf"
@@ -820,7 +961,7 @@ def run(
 
         print(f"[DEBUG] Overlay PDF written to {debug_pdf}")
 
-    return output_xlsx
+    return outputs[0]
 
 
 # ==================================================
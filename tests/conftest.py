@@ -0,0 +1,27 @@
+import fitz  # PyMuPDF
+import pytest
+
+
+@pytest.fixture
+def make_pdf(tmp_path):
+    """
+    Builds a PDF from pages of (x, y, text[, size[, bold]]) lines; an
+    empty list is a blank page. Returns the file path.
+    """
+
+    def build(pages, name="manual.pdf"):
+        doc = fitz.open()
+
+        for lines in pages:
+            page = doc.new_page(width=612, height=792)
+
+            for x, y, text, *style in lines:
+                size = style[0] if style else 9
+                bold = style[1] if len(style) > 1 else False
+                page.insert_text((x, y), text, fontsize=size, fontname="hebo" if bold else "helv")
+
+        path = str(tmp_path / name)
+        doc.save(path)
+        return path
+
+    return build
@@ -0,0 +1,22 @@
+import csv
+import shutil
+
+from run_batch import run_batch
+
+
+def test_combined_filenames_relative_to_common_directory(make_pdf, tmp_path):
+    pdf = make_pdf([[(60, 60 + 16 * i, f"Replace the filter element (P/N 88001{i}) every 500 hours.")
+                     for i in range(4)]])
+
+    # Sibling directories sharing a name prefix ("manuals_")
+    for folder in ("manuals_a", "manuals_b"):
+        (tmp_path / folder).mkdir()
+        shutil.copy(pdf, tmp_path / folder / "pump.pdf")
+
+    out_dir = tmp_path / "out"
+    run_batch(str(tmp_path / "manuals_*" / "*.pdf"), str(out_dir), output_formats=("csv",), combined=True)
+
+    with open(out_dir / "combined.csv", encoding="utf-8") as f:
+        filenames = {row["filename"] for row in csv.DictReader(f)}
+
+    assert filenames == {"manuals_a/pump.pdf", "manuals_b/pump.pdf"}
@@ -0,0 +1,55 @@
+import os
+
+import pytest
+
+import run_pipeline
+from multitable_inline.step5_export import CsvPartsWriter
+
+
+INLINE_PAGE = [
+    (60, 60, "LUBE OIL PUMP ASSEMBLY", 16, True),
+] + [
+    (60, 100 + 16 * i, f"Replace the filter element (P/N 88001{i}) every 500 hours.")
+    for i in range(4)
+]
+
+
+def _fail_extraction_on_page(monkeypatch, page_no):
+    # As in a parallel run, where a shard's extractor error surfaces
+    # while earlier pages are already written
+    iter_merged_pages = run_pipeline._iter_merged_pages
+
+    def failing(shards, **kwargs):
+        for head, extracted_parts in iter_merged_pages(shards, **kwargs):
+            if extracted_parts and extracted_parts[0]["page"] == page_no:
+                raise RuntimeError("bad page")
+            yield head, extracted_parts
+
+    monkeypatch.setattr(run_pipeline, "_iter_merged_pages", failing)
+
+
+def _fail_csv_write(monkeypatch):
+    def full_disk(self, row, p):
+        raise OSError("No space left on device")
+
+    monkeypatch.setattr(CsvPartsWriter, "write_row", full_disk)
+
+
+@pytest.mark.parametrize("fail, error", [
+    (lambda mp: _fail_extraction_on_page(mp, 3), RuntimeError),
+    (_fail_csv_write, OSError),
+])
+def test_failed_run_leaves_no_partial_output(make_pdf, tmp_path, monkeypatch, fail, error):
+    pdf = make_pdf([INLINE_PAGE, INLINE_PAGE, INLINE_PAGE])
+    out_dir = tmp_path / "out"
+
+    fail(monkeypatch)
+
+    with pytest.raises(error):
+        run_pipeline.run(
+            pdf,
+            str(out_dir / "parts.xlsx"),
+            output_formats=("xlsx", "csv", "ndjson", "parquet")
+        )
+
+    assert os.listdir(out_dir) == []
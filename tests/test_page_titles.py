@@ -0,0 +1,52 @@
+from multitable_inline.provenance import Trace
+from multitable_inline.step1_extract_tables import pages_to_extract
+from run_pipeline import _process_page_shard
+
+
+SPARES_OVERVIEW = [
+    (60, 60, "SECTION 4 OVERVIEW OF SPARES", 16, True),
+    (60, 100, "This section lists the recommended spares."),
+]
+
+
+def _titles(shard):
+    return {page: {p["title"] for p in parts} for page, parts, _, _ in shard["pages"] if parts}
+
+
+def test_trace_with_only_deferred_roles_is_truthy():
+    trace = Trace()
+    trace.defer("pn_boxes", lambda t: [{"top": 1.0}])
+
+    assert trace
+    assert "pn_boxes" in trace
+    assert len(trace) == 1
+
+
+def test_inline_title_anchors_on_extracted_part_numbers(make_pdf):
+    # The document number above the title also matches PART_NO_REGEX;
+    # the anchor must come from the extracted parts, not the first match
+    pdf = make_pdf([
+        SPARES_OVERVIEW,
+        [(60, 40, "Document 4471-22 Rev B", 8),
+         (60, 80, "MAINTENANCE PROCEDURES", 16, True)] +
+        [(60, 120 + 16 * i, f"Replace the filter element (P/N 88001{i}) every 500 hours.")
+         for i in range(4)],
+    ])
+
+    assert _titles(_process_page_shard(pdf)) == {2: {"MAINTENANCE PROCEDURES"}}
+
+
+def test_previous_page_title_skips_blank_page_in_selection(make_pdf):
+    pdf = make_pdf([
+        SPARES_OVERVIEW,
+        [(60, 60, "LUBE OIL PUMP ASSEMBLY AND DRIVE", 16, True),
+         (60, 100, "General arrangement of the pump.")],
+        [],
+        [(60, 60 + 16 * i, f"Replace the filter element (P/N 88001{i}) every 500 hours.")
+         for i in range(4)],
+    ])
+
+    expected = {4: {"LUBE OIL PUMP ASSEMBLY AND DRIVE"}}
+
+    assert _titles(_process_page_shard(pdf)) == expected
+    assert _titles(_process_page_shard(pdf, pages_to_extract([4]), [4])) == expected
@@ -0,0 +1,38 @@
+import pytest
+
+from multitable_inline.vendor_catalog import VendorCatalog
+from run_pipeline import VENDOR_CATALOG_PATH, detect_vendor_from_filename
+
+
+QUINCY_FIRST_PAGE = [{"page_text": "QUINCY COMPRESSOR\nRotary screw air compressor"}]
+
+
+@pytest.mark.parametrize("filename, model", [
+    ("QuincyQR-370LS.pdf", "QR 370LS"),
+    ("QUINCYQR370.pdf", "QR370"),
+])
+def test_filename_vendor_glued_to_model(filename, model):
+    catalog = VendorCatalog.from_names(["QUINCY"])
+
+    assert detect_vendor_from_filename(filename, QUINCY_FIRST_PAGE, catalog) == ("QUINCY", model)
+
+
+def test_page_text_matches_whole_words_only():
+    catalog = VendorCatalog.from_names(["EATON"])
+
+    assert catalog.match("SUPPLIED BY BEATON LTD") == (None, None)
+    assert catalog.match("Supplied by Eaton Ltd") == ("EATON", "EATON")
+
+
+def test_title_case_catalog_entries_are_matched():
+    catalog = VendorCatalog(entries=[("Cameron", ["Cameron Intl"])])
+
+    assert catalog.match("CAMERON INTL WELLHEAD SYSTEMS") == ("Cameron", "CAMERON")
+    assert catalog.match("Wellhead by cameron") == ("Cameron", "CAMERON")
+
+
+def test_shipped_catalog_skips_common_words():
+    catalog = VendorCatalog(VENDOR_CATALOG_PATH)
+
+    assert catalog.match("Derrick mounted vertical pipe racker") == (None, None)
+    assert catalog.match("Eaton Corporation hydraulics") == ("EATON", "EATON")